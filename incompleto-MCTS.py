@@ -1,15 +1,16 @@
-# Este script contiene una implementacion simple del algoritmo UCT Monte Carlo Tree Search (MCTS UTC) en Python 2.7
+# Este script contiene una implementacion simple del algoritmo UCT Monte Carlo Tree Search (MCTS UTC) en Python 3
 # La funcion estrella UCT(rootstate, itermax, verbose = False) se encuentra cerca del fondo del codigo.
 # La eficiencia de este algoritmo se ha reducido para aumentar la claridad de su implementacion.
 
 # Escrito por Peter Cowling, Ed Powley, Daniel Whitehouse and Daniel Hernandez (University of York, UK) September 2012 - 2017.
 
-from __future__ import division  # Para que el operador de division '/' tenga la misma funcionalidad que Python3.
-from math import *  # Necesario para la equacion de UCB1. Usaremos math.sqrt y math.log
+from math import log, sqrt  # Necesario para la equacion de UCB1
 import random
 
-import colorama # Para imprimir texto de colores en la terminal.
-from colorama import Fore
+try:
+    import colorama  # Opcional: para imprimir texto de colores en la terminal.
+except ImportError:
+    colorama = None
 
 
 class GameState:
@@ -163,8 +164,11 @@ class Connect4State:
         s = ""
         for x in range(self.height - 1, -1, -1):
             for y in range(self.width):
-                s += [Fore.WHITE + '.', Fore.RED + 'X', Fore.YELLOW + 'O'][self.board[y][x]]
-                s += Fore.RESET
+                if colorama is not None:
+                    Fore = colorama.Fore
+                    s += [Fore.WHITE + '.', Fore.RED + 'X', Fore.YELLOW + 'O'][self.board[y][x]] + Fore.RESET
+                else:
+                    s += ['.', 'X', 'O'][self.board[y][x]]
             s += "\n"
         return s
 
@@ -294,10 +298,11 @@ def HumanInput(state):
     move = None
     while move not in valid_moves:
         interface_moves = [move + 1 for move in valid_moves]
-        move = int(raw_input("Possible moves are: " + str(interface_moves) + ' '))
+        move = int(input("Possible moves are: " + str(interface_moves) + ' '))
         move -= 1
     return move
 
 if __name__ == "__main__":
-    colorama.init()  # Initiates colorma for color terminal text. This is required for windows machines
+    if colorama is not None:
+        colorama.init()  # Initiates colorma for color terminal text. This is required for windows machines
     PlayGame(Connect4State(width=7, height= 6)) # Comienza el juego!
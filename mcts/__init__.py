@@ -0,0 +1,61 @@
+# Implementacion de MCTS-UCT (Monte Carlo Tree Search) para Connect4, en forma de paquete importable.
+# La funcion estrella UCT(rootstate, itermax, verbose = False) esta en mcts.search.
+#   mcts.game      GameState, Connect4State, BitboardConnect4State
+#   mcts.tree      Node y sus variantes, MCTS-Solver (valores demostrados), NodeLimit
+#   mcts.search    UCT, UCTSearch, SelectMove, MCTSPlayer y las busquedas paralelas y por lotes
+#   mcts.policies  politicas de simulacion y de expansion
+#   mcts.solver    EndgameSolver
+#   mcts.export    ExportTree, LoadTree
+#   mcts.book      OpeningBook, BuildOpeningBook
+#   mcts.cli       linea de comandos (python -m mcts, o el comando mcts si se instala el paquete)
+#
+# Los nombres de todos los submodulos se pueden importar directamente de mcts (from mcts import UCT), pero cada
+# submodulo se importa la primera vez que se pide uno de sus nombres (PEP 562). Asi import mcts es casi
+# gratis y un proceso que solo necesita game y search no paga por el resto (ver BenchmarkImportTime).
+
+# Escrito por Peter Cowling, Ed Powley, Daniel Whitehouse and Daniel Hernandez (University of York, UK) September 2012 - 2017.
+
+import importlib
+
+# submodulo -> nombres que exporta
+_EXPORTS = {
+    'game': ['GameState', 'ZOBRIST_KEYS', 'ZobristKeys', 'WIN_SHIFTS', 'WinShifts', 'PLAYER_SYMBOLS', 'Connect4State',
+             'BitboardConnect4State'],
+    'policies': ['RandomRolloutPolicy', 'THREAT_TABLES', 'ThreatTables', 'Connect4ThreatPolicy', 'RandomExpansion',
+                 'CentrePrior', 'ThreatPrior', 'ProgressiveWidening'],
+    'tree': ['PROVEN_WIN', 'PROVEN_DRAW', 'PROVEN_LOSS', 'PROVEN_NAMES', 'Node', 'NodeLimit', 'NodeBytes',
+             'UCB1Argmax', 'RaveNode', 'UpdateAmaf', 'SharedNode', 'ArrayTree', 'TranspositionNode',
+             'TranspositionTable', 'CountNodes'],
+    'search': ['SearchStats', 'ArrayUCTSearch', 'UCT', 'UCTSearch', 'MergeMirroredMoves', 'CanonicalMoves',
+               'OrientMove', 'IsSearchDecided', 'SelectMove', 'ProvenResults', 'UpdateProven', 'MCTSPlayer',
+               'ParallelUCT', 'UCTWorker', 'TreeParallelUCT', 'TreeParallelWorker', 'TranspositionUCT',
+               'TranspositionSearch', 'BatchRollout', 'BatchWins', 'BatchUCTSearch'],
+    'solver': ['SOLVER_EXACT', 'SOLVER_LOWER', 'SOLVER_UPPER', 'EndgameSolver'],
+    'export': ['TREE_MAGIC', 'TREE_RECORD', 'WalkTree', 'ExportTree', 'ReadTree', 'LoadTree'],
+    'book': ['BOOK_PATH', 'BOOK_HEADER', 'BOOK_MAGIC', 'OpeningBook', 'BookPositions', 'BookWorker',
+             'BuildOpeningBook'],
+    'benchmarks': ['BenchmarkParallelUCT', 'CalibrateItermax', 'PlayAgents', 'BenchmarkTreeParallelUCT',
+                   'BenchmarkTranspositions', 'BenchmarkMemory', 'CountInstances',
+                   'BenchmarkSelection', 'BenchmarkRollouts', 'BenchmarkUndoMoves', 'BenchmarkRolloutPolicy',
+                   'BenchmarkSymmetry', 'BenchmarkSearchStats', 'BenchmarkTreeExport', 'BenchmarkVariants',
+                   'BenchmarkSolver', 'BenchmarkRave', 'BenchmarkWidening', 'BenchmarkImportTime',
+                   'SUITES'],
+    'backend': ['Numpy', 'RequireNumpy'],
+}
+
+_MODULE_OF = dict((name, module) for (module, names) in _EXPORTS.items() for name in names)
+
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    globals()[name] = value  # las siguientes veces no pasa por __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
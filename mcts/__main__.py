@@ -0,0 +1,7 @@
+# python -m mcts [comando]: ver mcts.cli
+
+import sys
+
+from .cli import Main
+
+sys.exit(Main())
@@ -0,0 +1,33 @@
+# Backends opcionales del motor. Se importan la primera vez que se usan, no al importar el paquete:
+# importar NumPy tarda mas que todo mcts (ver BenchmarkImportTime) y la mayoria de busquedas no lo necesitan.
+
+_numpy = None
+
+
+def Numpy():
+    """ El modulo numpy, importado la primera vez que se pide. Lo usan los caminos vectorizados
+        (UCB1Argmax, Node.UCTSelectChildNumpy, BatchRollout, BatchUCTSearch).
+
+        @output: (module) numpy, o None si no esta instalado.
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def RequireNumpy(feature):
+    """ Igual que Numpy(), pero si NumPy no esta instalado lanza un ImportError que dice quien lo necesita.
+
+        @input feature: (str) nombre de la funcion que necesita NumPy, para el mensaje de error.
+
+        @output: (module) numpy
+    """
+    numpy = Numpy()
+    if numpy is None:
+        raise ImportError(feature + " necesita NumPy (pip install numpy)")
+    return numpy
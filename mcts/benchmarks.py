@@ -0,0 +1,556 @@
+# Benchmarks de las funcionalidades del motor. Se ejecutan con python -m mcts bench <suite> o python -m mcts_bench <suite>.
+
+import gc
+import os
+import random
+import time
+from math import log, sqrt
+
+from .backend import Numpy
+from .export import ExportTree, LoadTree
+from .game import BitboardConnect4State, Connect4State
+from .policies import CentrePrior, Connect4ThreatPolicy, ProgressiveWidening, ThreatPrior
+from .search import ArrayUCTSearch, BatchRollout, ParallelUCT, SearchStats, SelectMove, TranspositionSearch, TreeParallelUCT, UCTSearch
+from .solver import EndgameSolver
+from .tree import CountNodes, Node, TranspositionTable, UCB1Argmax
+
+
+def BenchmarkParallelUCT(itermax=20000, maxWorkers=None, seed=0):
+    """ Mide las iteraciones por segundo de ParallelUCT desde el tablero vacio
+        con 1, 2, 4, ... procesos hasta maxWorkers (por defecto, el numero de CPUs).
+
+        @input itermax: (int) numero total de iteraciones de cada busqueda
+    """
+    import multiprocessing
+    if maxWorkers is None:
+        maxWorkers = multiprocessing.cpu_count()
+    workerCounts = [1]
+    while workerCounts[-1] * 2 <= maxWorkers:
+        workerCounts.append(workerCounts[-1] * 2)
+    if workerCounts[-1] != maxWorkers:
+        workerCounts.append(maxWorkers)
+
+    rootstate = BitboardConnect4State(width=7, height=6)
+    print("workers  segundos  iteraciones/s")
+    for workers in workerCounts:
+        pool = multiprocessing.Pool(workers)
+        try:
+            start = time.time()  # el pool ya esta creado: solo se mide la busqueda
+            ParallelUCT(rootstate, itermax, workers=workers, seed=seed, pool=pool)
+            elapsed = time.time() - start
+        finally:
+            pool.close()
+            pool.join()
+        print("%7d  %8.2f  %13.0f" % (workers, elapsed, itermax / elapsed))
+
+
+def CalibrateItermax(search, rootstate, seconds, probe=1000, clock=time.time):
+    """ Estima cuantas iteraciones puede hacer search(rootstate, itermax) en seconds segundos.
+        Sirve para comparar algoritmos con el mismo tiempo por movimiento en vez del mismo itermax.
+
+        @input clock: funcion que devuelve el tiempo actual (time.time = wall-clock, time.process_time = CPU).
+    """
+    start = clock()
+    search(rootstate, probe)
+    return max(1, int(probe * seconds / (clock() - start)))
+
+
+def PlayAgents(agent1, agent2, initialState, games, seed=0):
+    """ Juega games partidas entre dos agentes alternando quien empieza.
+        Un agente es una funcion agent(state) -> move.
+
+        @output: (tuple) (victorias de agent1, empates, victorias de agent2)
+    """
+    wins1, draws, wins2 = 0, 0, 0
+    for g in range(games):
+        random.seed(seed + g)
+        agents = {1: agent1, 2: agent2} if g % 2 == 0 else {1: agent2, 2: agent1}
+        state = initialState.Clone()
+        while not state.IsGameOver():
+            state.DoMove(agents[3 - state.playerJustMoved](state))
+        if state.winner == 0:
+            draws += 1
+        elif agents[state.winner] is agent1:
+            wins1 += 1
+        else:
+            wins2 += 1
+    return wins1, draws, wins2
+
+
+def BenchmarkTreeParallelUCT(secondsPerMove=0.1, games=20, threads=4, virtualLoss=3):
+    """ Compara la fuerza de juego de TreeParallelUCT contra UCT y contra ParallelUCT
+        con el mismo tiempo (wall-clock) por movimiento. El itermax de cada algoritmo se calibra
+        antes de jugar para que cada busqueda dure aproximadamente secondsPerMove segundos.
+    """
+    import multiprocessing
+    rootstate = BitboardConnect4State(width=7, height=6)
+    workers = multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(workers)
+    try:
+        searches = [
+            ("UCT", lambda s, n: SelectMove(UCTSearch(s, n))),
+            ("ParallelUCT", lambda s, n: ParallelUCT(s, n, workers=workers, pool=pool)),
+            ("TreeParallelUCT", lambda s, n: TreeParallelUCT(s, n, threads=threads, virtualLoss=virtualLoss)),
+        ]
+        agents = {}
+        for (name, search) in searches:
+            itermax = CalibrateItermax(search, rootstate, secondsPerMove)
+            agents[name] = (lambda search, itermax: lambda s: search(s, itermax))(search, itermax)
+            print("%-16s %6d iteraciones en %.2fs" % (name, itermax, secondsPerMove))
+
+        print("TreeParallelUCT contra:  victorias  empates  derrotas")
+        for opponent in ["UCT", "ParallelUCT"]:
+            result = PlayAgents(agents["TreeParallelUCT"], agents[opponent], rootstate, games)
+            print("%-22s %10d %8d %9d" % (opponent, result[0], result[1], result[2]))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def BenchmarkTranspositions(itermax=20000, seed=0):
+    """ Compara UCTSearch (arbol) con TranspositionSearch (DAG) con el mismo itermax desde el tablero vacio:
+        numero de nodos, transposiciones encontradas, iteraciones por segundo y nodos por segundo.
+    """
+    rootstate = BitboardConnect4State(width=7, height=6)
+
+    random.seed(seed)
+    start = time.time()
+    rootnode = UCTSearch(rootstate, itermax)
+    treeTime = time.time() - start
+    treeNodes = CountNodes(rootnode)
+
+    random.seed(seed)
+    table = TranspositionTable()
+    start = time.time()
+    TranspositionSearch(rootstate, itermax, table)
+    tableTime = time.time() - start
+    tableNodes = len(table)
+
+    print("              nodos  transposiciones  iteraciones/s  nodos/s")
+    print("arbol   %11d  %15d  %13.0f  %7.0f" % (treeNodes, 0, itermax / treeTime, treeNodes / treeTime))
+    print("DAG     %11d  %15d  %13.0f  %7.0f" % (tableNodes, table.hits, itermax / tableTime, tableNodes / tableTime))
+    print("Nodos ahorrados: %d (%.1f%%)" % (treeNodes - tableNodes, 100 * (treeNodes - tableNodes) / treeNodes))
+
+
+def BenchmarkMemory(itermax=50000, seed=0):
+    """ Mide la memoria por nodo del game tree con objetos Node y con ArrayTree (usa tracemalloc).
+    """
+    import tracemalloc
+    rootstate = BitboardConnect4State(width=7, height=6)
+
+    print("            nodos  bytes/nodo  iteraciones/s")
+    for (name, search, count) in [("Node", UCTSearch, CountNodes),
+                                  ("ArrayTree", ArrayUCTSearch, lambda tree: tree.size)]:
+        random.seed(seed)
+        tracemalloc.start()
+        start = time.time()
+        tree = search(rootstate, itermax)
+        elapsed = time.time() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        nodes = count(tree)
+        print("%-9s %7d  %10.1f  %13.0f" % (name, nodes, memory / nodes, itermax / elapsed))
+        del tree
+
+
+def BenchmarkSelection(childCounts=(7, 50, 500), repeats=2000, seed=0):
+    """ Compara el coste de seleccionar un hijo con UCB1 para distintos numeros de hijos:
+        ordenando todos los hijos (como se hacia antes), con Node.UCTSelectChild (una pasada),
+        con Node.UCTSelectChildNumpy y con UCB1Argmax sobre arrays contiguos ya construidos.
+    """
+    np = Numpy()
+    rng = random.Random(seed)
+    print("hijos  sorted(us)  argmax(us)  numpy(us)  arrays(us)")
+    for k in childCounts:
+        state = Connect4State(width=k, height=6)
+        parent = Node(state=state)
+        for m in state.GetMoves():
+            child = Node(move=m, parent=parent, state=state)
+            child.visits = rng.randint(1, 1000)
+            child.wins = rng.randint(0, child.visits)
+            parent.childNodes.append(child)
+            parent.visits += child.visits
+
+        timings = []
+        candidates = [lambda: sorted(parent.childNodes, key=lambda c: c.wins / c.visits + sqrt(2 * log(parent.visits) / c.visits))[-1],
+                      lambda: parent.UCTSelectChild()]
+        if np is not None:
+            wins = np.array([c.wins for c in parent.childNodes], dtype=np.float64)
+            visits = np.array([c.visits for c in parent.childNodes], dtype=np.float64)
+            candidates.append(lambda: parent.UCTSelectChildNumpy())
+            candidates.append(lambda: UCB1Argmax(wins, visits, parent.visits))
+        for select in candidates:
+            start = time.time()
+            for r in range(repeats):
+                select()
+            timings.append(1e6 * (time.time() - start) / repeats)
+        print("%5d" % k + "".join("  %10.2f" % t for t in timings))
+
+
+def BenchmarkRollouts(rollouts=4096, batchSizes=(1, 16, 256, 4096), seed=0):
+    """ Simulaciones aleatorias por segundo desde el tablero vacio: una a una con cada GameState
+        (como en la fase de simulacion de UCTSearch) y en lotes de distintos tamanhos con BatchRollout.
+    """
+    np = Numpy()
+    print("metodo                       simulaciones/s")
+    for cls in [Connect4State, BitboardConnect4State]:
+        random.seed(seed)
+        rootstate = cls(width=7, height=6)
+        start = time.time()
+        for r in range(rollouts):
+            state = rootstate.Clone()
+            while not state.IsGameOver():
+                state.DoMove(state.RandomMove())
+        print("%-28s %14.0f" % (cls.__name__, rollouts / (time.time() - start)))
+    if np is None:
+        print("BatchRollout necesita NumPy")
+        return
+    rng = np.random.RandomState(seed)
+    for batchSize in batchSizes:
+        states = [Connect4State(width=7, height=6)] * batchSize
+        start = time.time()
+        for b in range(rollouts // batchSize):
+            BatchRollout(states, rng)
+        print("%-28s %14.0f" % ("BatchRollout (lote %d)" % batchSize, (rollouts // batchSize) * batchSize / (time.time() - start)))
+
+
+def CountInstances(cls, Run):
+    """ Ejecuta Run() y cuenta los objetos cls que se crean, envolviendo cls.__init__ mientras dura la llamada.
+
+        @output: (int) numero de llamadas a cls.__init__.
+    """
+    own = cls.__dict__.get('__init__')  # None si cls hereda __init__
+    init = cls.__init__
+    created = [0]
+
+    def CountingInit(self, *args, **kwargs):
+        created[0] += 1
+        init(self, *args, **kwargs)
+
+    cls.__init__ = CountingInit
+    try:
+        Run()
+    finally:
+        if own is None:
+            del cls.__init__
+        else:
+            cls.__init__ = own
+    return created[0]
+
+
+def BenchmarkUndoMoves(itermax=20000, seed=0):
+    """ Compara UCTSearch con Clone() por iteracion y con DoMove/UndoMove sobre un unico GameState:
+        iteraciones por segundo, objetos GameState creados, y pasadas y tiempo del recolector de basura (gc).
+        El gc se mide con gc.callbacks. Los objetos creados se cuentan en otra busqueda con la misma semilla
+        (ver CountInstances), para que el contador no cambie el tiempo medido.
+    """
+    gcStats = {"collections": 0, "seconds": 0.0, "start": 0.0}
+
+    def OnGc(phase, info):
+        if phase == "start":
+            gcStats["start"] = time.time()
+        else:
+            gcStats["collections"] += 1
+            gcStats["seconds"] += time.time() - gcStats["start"]
+
+    gc.callbacks.append(OnGc)
+    try:
+        print("GameState              modo   iteraciones/s  estados/iter  gc/1000 iter  gc ms")
+        for cls in [Connect4State, BitboardConnect4State]:
+            rootstate = cls(width=7, height=6)
+            for undoMoves in [False, True]:
+                random.seed(seed)
+                gc.collect()
+                gcStats["collections"], gcStats["seconds"] = 0, 0.0
+                start = time.time()
+                UCTSearch(rootstate, itermax, undoMoves=undoMoves)
+                elapsed = time.time() - start
+                collections, gcSeconds = gcStats["collections"], gcStats["seconds"]
+                random.seed(seed)
+                created = CountInstances(cls, lambda: UCTSearch(rootstate, itermax, undoMoves=undoMoves))
+                print("%-22s %-6s %14.0f  %12.4f  %12.2f  %5.1f" % (cls.__name__, "undo" if undoMoves else "clone",
+                                                                 itermax / elapsed, created / itermax,
+                                                                 1000 * collections / itermax, 1000 * gcSeconds))
+    finally:
+        gc.callbacks.remove(OnGc)
+
+
+def BenchmarkRolloutPolicy(secondsPerMove=0.05, games=20, itermax=1000):
+    """ Compara UCT con simulaciones al azar y con Connect4ThreatPolicy. La politica con conocimiento
+        hace cada iteracion mas cara, asi que se compara con el mismo tiempo de CPU por movimiento
+        (fuerza por segundo de CPU) y, como referencia, con el mismo itermax (fuerza por iteracion).
+    """
+    cpuClock = time.process_time
+    rootstate = BitboardConnect4State(width=7, height=6)
+    policy = Connect4ThreatPolicy(width=7, height=6)
+    searches = {
+        "aleatoria": lambda s, n: SelectMove(UCTSearch(s, n)),
+        "amenazas": lambda s, n: SelectMove(UCTSearch(s, n, rolloutPolicy=policy)),
+    }
+    budgets = {}
+    for name in ["aleatoria", "amenazas"]:
+        budgets[name] = CalibrateItermax(searches[name], rootstate, secondsPerMove, clock=cpuClock)
+        print("%-10s %6d iteraciones en %.2fs de CPU" % (name, budgets[name], secondsPerMove))
+
+    print("amenazas contra aleatoria:  victorias  empates  derrotas")
+    for (label, heavyIters, randomIters) in [("mismo tiempo de CPU", budgets["amenazas"], budgets["aleatoria"]),
+                                             ("mismo itermax", itermax, itermax)]:
+        heavy = (lambda n: lambda s: searches["amenazas"](s, n))(heavyIters)
+        light = (lambda n: lambda s: searches["aleatoria"](s, n))(randomIters)
+        result = PlayAgents(heavy, light, rootstate, games)
+        print("%-25s %10d %8d %9d" % (label, result[0], result[1], result[2]))
+
+
+def BenchmarkSymmetry(itermax=5000, games=20, gameItermax=1000, seed=0):
+    """ Compara UCTSearch y TranspositionSearch con y sin symmetry desde el tablero vacio (simetrico):
+        hijos de la raiz y visitas por hijo (iteraciones efectivas por movimiento distinto), iteraciones por segundo
+        y nodos de la tabla de transposiciones. Despues juega UCT con symmetry contra UCT sin symmetry
+        con el mismo itermax y con el doble de itermax para el rival.
+    """
+    rootstate = BitboardConnect4State(width=7, height=6)
+    print("symmetry  hijos  visitas/hijo  iteraciones/s  nodos DAG")
+    for symmetry in [False, True]:
+        random.seed(seed)
+        start = time.time()
+        rootnode = UCTSearch(rootstate, itermax, symmetry=symmetry)
+        elapsed = time.time() - start
+        random.seed(seed)
+        table = TranspositionTable()
+        TranspositionSearch(rootstate, itermax, table, symmetry)
+        children = len(rootnode.childNodes)
+        print("%8s  %5d  %12.0f  %13.0f  %9d" % (symmetry, children, itermax / children, itermax / elapsed, len(table)))
+
+    print("symmetry contra sin symmetry:  victorias  empates  derrotas")
+    for (label, plainIters) in [("mismo itermax", gameItermax), ("rival con 2 x itermax", 2 * gameItermax)]:
+        mirrored = lambda s: SelectMove(UCTSearch(s, gameItermax, symmetry=True))
+        plain = (lambda n: lambda s: SelectMove(UCTSearch(s, n)))(plainIters)
+        result = PlayAgents(mirrored, plain, rootstate, games, seed)
+        print("%-28s %10d %8d %9d" % (label, result[0], result[1], result[2]))
+
+
+def BenchmarkSearchStats(itermax=20000, seed=0):
+    """ Mide el coste de SearchStats: iteraciones por segundo de UCTSearch sin stats, con stats y con stats y callback,
+        e imprime las estadisticas de la busqueda desde el tablero vacio.
+    """
+    rootstate = BitboardConnect4State(width=7, height=6)
+    callbacks = []
+    configs = [("sin stats", None), ("stats", SearchStats()), ("stats + callback", SearchStats(callbacks.append, 1000))]
+    print("                  iteraciones/s")
+    for (label, stats) in configs:
+        random.seed(seed)
+        start = time.time()
+        UCTSearch(rootstate, itermax, stats=stats)
+        print("%-16s  %13.0f" % (label, itermax / (time.time() - start)))
+    print("callbacks: %d" % len(callbacks))
+    print(configs[1][1])
+
+
+def BenchmarkTreeExport(itermax=50000, seed=0):
+    """ Compara Node.TreeToString con ExportTree en cada formato para un arbol de itermax iteraciones:
+        segundos, pico de memoria (tracemalloc) y tamanho del fichero. Despues relee
+        los ficheros jsonl y bin con LoadTree y comprueba que tienen los mismos nodos. Tambien exporta con poda.
+    """
+    import tempfile
+    import tracemalloc
+    random.seed(seed)
+    rootnode = UCTSearch(BitboardConnect4State(width=7, height=6), itermax)
+    nodes = CountNodes(rootnode)
+    directory = tempfile.mkdtemp()
+
+    def Measure(function):
+        """ Ejecuta function dos veces: una para medir el tiempo y otra con tracemalloc (que la hace mas lenta).
+        """
+        start = time.time()
+        function()
+        elapsed = time.time() - start
+        tracemalloc.start()
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result, elapsed, peak
+
+    print("%d nodos" % nodes)
+    print("                     segundos  pico de memoria (KB)  fichero (KB)")
+    text, elapsed, peak = Measure(lambda: rootnode.TreeToString(0))
+    print("TreeToString         %8.2f  %20.0f  %12.0f" % (elapsed, peak / 1024, len(text) / 1024))
+    del text
+    for (label, fmt, minVisits, maxDepth) in [("jsonl", "jsonl", 0, None), ("dot", "dot", 0, None), ("bin", "bin", 0, None),
+                                               ("jsonl visitas>=10", "jsonl", 10, None), ("dot profundidad<=3", "dot", 0, 3)]:
+        path = os.path.join(directory, "arbol." + fmt)
+        count, elapsed, peak = Measure(lambda: ExportTree(rootnode, path, fmt, minVisits, maxDepth))
+        print("%-19s  %8.2f  %20.0f  %12.0f  (%d nodos)" % (label, elapsed, peak / 1024, os.path.getsize(path) / 1024, count))
+        if fmt != "dot" and minVisits == 0:
+            loaded = LoadTree(path)
+            assert CountNodes(loaded) == nodes and loaded.visits == rootnode.visits
+        os.remove(path)
+    os.rmdir(directory)
+
+
+def BenchmarkVariants(itermax=5000, seed=0):
+    """ Iteraciones por segundo de UCTSearch con Connect4State y BitboardConnect4State en el juego normal
+        (7 x 6, 4 en raya, 2 jugadores) y en las variantes: tablero de 8 x 7, 5 en raya y 3 jugadores.
+        Para comprobar que el juego normal no se ha hecho mas lento, comparar con una version anterior:
+        python -m mcts_bench --output base.json (antes) y python -m mcts_bench --compare base.json (despues).
+    """
+    variants = [("7x6, 4 en raya, 2 jugadores", 7, 6, 4, 2), ("8x7, 4 en raya, 2 jugadores", 8, 7, 4, 2),
+                ("7x6, 5 en raya, 2 jugadores", 7, 6, 5, 2), ("7x6, 4 en raya, 3 jugadores", 7, 6, 4, 3)]
+    print("                              Connect4State  BitboardConnect4State  (iteraciones/s)")
+    for (label, width, height, connect, players) in variants:
+        speeds = []
+        for stateClass in [Connect4State, BitboardConnect4State]:
+            rootstate = stateClass(width=width, height=height, connect=connect, players=players)
+            random.seed(seed)
+            start = time.time()
+            UCTSearch(rootstate, itermax)
+            speeds.append(itermax / (time.time() - start))
+        print("%-28s  %13.0f  %21.0f" % (label, speeds[0], speeds[1]))
+
+
+def BenchmarkSolver(itermax=5000, games=20, gameItermax=1000, seed=0):
+    """ Compara UCTSearch con y sin MCTS-Solver en finales de partida. Las posiciones salen de 8 partidas de UCT contra
+        si mismo; para cada numero de casillas vacias se mide el tiempo, las iteraciones hasta terminar, cuantas raices
+        quedan demostradas y cuantas veces el movimiento escogido es uno de los mejores (segun EndgameSolver sin limite).
+        Despues juega UCT con solver contra UCT sin solver con el mismo itermax.
+    """
+    random.seed(seed)
+    selfPlay = []
+    for g in range(8):
+        state, moves = BitboardConnect4State(width=7, height=6), []
+        while not state.IsGameOver():
+            m = SelectMove(UCTSearch(state, gameItermax))
+            state.DoMove(m)
+            moves.append(m)
+        selfPlay.append(moves)
+
+    exact = EndgameSolver(maxEmpty=42)
+    print("vacias  maxEmpty  posiciones  segundos  iteraciones  demostradas  mejor movimiento")
+    for empty in [14, 18, 22]:
+        positions = []
+        for moves in selfPlay:
+            if len(moves) > 42 - empty:
+                state = BitboardConnect4State(width=7, height=6)
+                for m in moves[:42 - empty]:
+                    state.DoMove(m)
+                values = {}
+                for m in state.GetMoves():
+                    state.DoMove(m)
+                    values[m] = -exact.Solve(state)
+                    state.UndoMove()
+                positions.append((state, values))
+        for maxEmpty in [None, 0, 12]:
+            seconds, iterations, proven, best = 0.0, 0, 0, 0
+            for (state, values) in positions:
+                solver = EndgameSolver(maxEmpty=maxEmpty) if maxEmpty is not None else None
+                random.seed(seed)
+                start = time.time()
+                rootnode = UCTSearch(state, itermax, solver=solver)
+                seconds += time.time() - start
+                iterations += rootnode.visits
+                proven += rootnode.proven is not None
+                best += values[SelectMove(rootnode)] == max(values.values())
+            n = len(positions)
+            print("%6d  %8s  %10d  %8.3f  %11.0f  %11d  %16d"
+                  % (empty, "-" if maxEmpty is None else maxEmpty, n, seconds / n, iterations / n, proven, best))
+
+    print("solver contra sin solver:  victorias  empates  derrotas")
+    withSolver = lambda s: SelectMove(UCTSearch(s, gameItermax, solver=EndgameSolver()))
+    plain = lambda s: SelectMove(UCTSearch(s, gameItermax))
+    result = PlayAgents(withSolver, plain, BitboardConnect4State(width=7, height=6), games, seed)
+    print("%-24s %10d %8d %9d" % ("mismo itermax", result[0], result[1], result[2]))
+
+
+def BenchmarkRave(itermax=20000, games=20, gameItermax=250, raveEquivalence=300, seed=0):
+    """ Mide el coste de RAVE (iteraciones por segundo desde el tablero vacio) y juega UCT con rave contra UCT sin rave
+        con el mismo itermax y contra un rival con 2 y 4 veces mas iteraciones. Para mas partidas, usar mcts_arena:
+        python -m mcts_arena --agent1 itermax=250,rave=1 --agent2 itermax=250 --games 200
+    """
+    rootstate = BitboardConnect4State(width=7, height=6)
+    print("         iteraciones/s")
+    for rave in [False, True]:
+        random.seed(seed)
+        start = time.time()
+        UCTSearch(rootstate, itermax, rave=rave, raveEquivalence=raveEquivalence)
+        print("%-8s %13.0f" % ("rave" if rave else "sin rave", itermax / (time.time() - start)))
+
+    print("rave contra sin rave:          victorias  empates  derrotas")
+    withRave = lambda s: SelectMove(UCTSearch(s, gameItermax, rave=True, raveEquivalence=raveEquivalence))
+    for factor in [1, 2, 4]:
+        plain = (lambda n: lambda s: SelectMove(UCTSearch(s, n)))(factor * gameItermax)
+        result = PlayAgents(withRave, plain, rootstate, games, seed)
+        print("%-28s %10d %8d %9d" % ("rival con %d x itermax" % factor, result[0], result[1], result[2]))
+
+
+def BenchmarkWidening(itermax=5000, games=20, gameItermax=500, seed=0):
+    """ Compara la expansion normal con ProgressiveWidening (CentrePrior, ThreatPrior y ThreatPrior con expandVisits=2)
+        desde el tablero vacio de 7 x 6, 9 x 7 y 12 x 10: iteraciones por segundo, nodos creados, hijos de la raiz
+        y profundidad media y maxima del arbol. Despues juega cada estrategia contra la expansion normal en 9 x 7
+        con el mismo itermax.
+    """
+    def Strategies(width, height):
+        return [("normal", None), ("centro", ProgressiveWidening(CentrePrior())),
+                ("amenazas", ProgressiveWidening(ThreatPrior(width, height))),
+                ("amenazas + expandVisits=2", ProgressiveWidening(ThreatPrior(width, height), expandVisits=2))]
+
+    print("tablero  expansion                  iteraciones/s  nodos  hijos raiz  profundidad media  maxima")
+    for (width, height) in [(7, 6), (9, 7), (12, 10)]:
+        rootstate = BitboardConnect4State(width=width, height=height)
+        for (label, expansion) in Strategies(width, height):
+            stats = SearchStats()
+            random.seed(seed)
+            rootnode = UCTSearch(rootstate, itermax, expansion=expansion, stats=stats)
+            print("%2d x %-2d  %-25s  %13.0f  %5d  %10d  %17.1f  %6d"
+                  % (width, height, label, itermax / stats.seconds, stats.nodes, len(rootnode.childNodes),
+                     stats.AverageDepth(), stats.maxDepth))
+
+    print("contra la expansion normal en 9 x 7:  victorias  empates  derrotas")
+    rootstate = BitboardConnect4State(width=9, height=7)
+    plain = lambda s: SelectMove(UCTSearch(s, gameItermax))
+    for (label, expansion) in Strategies(9, 7)[1:]:
+        widened = (lambda e: lambda s: SelectMove(UCTSearch(s, gameItermax, expansion=e)))(expansion)
+        result = PlayAgents(widened, plain, rootstate, games, seed)
+        print("%-36s %10d %8d %9d" % (label, result[0], result[1], result[2]))
+
+
+def BenchmarkImportTime(repeat=10):
+    """ Mide cuanto tarda cada import en un proceso nuevo (el mejor de repeat procesos), que es lo que pagan los
+        procesos de corta vida que solo importan el motor para una busqueda. Como referencia tambien mide numpy y
+        multiprocessing, que el paquete solo importa dentro de las funciones que los usan.
+    """
+    import subprocess
+    import sys
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    statements = ["import mcts", "from mcts import BitboardConnect4State, UCTSearch", "from mcts import UCT",
+                  "import mcts.cli", "from mcts import *", "import multiprocessing", "import numpy"]
+    print("import                                                ms")
+    for statement in statements:
+        code = "import time; t = time.perf_counter(); %s; print(time.perf_counter() - t)" % statement
+        best = None
+        for i in range(repeat):
+            process = subprocess.run([sys.executable, "-c", code], cwd=root, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL, universal_newlines=True)
+            if process.returncode != 0:
+                break
+            seconds = float(process.stdout)
+            best = seconds if best is None else min(best, seconds)
+        print("%-50s %7s" % (statement, "-" if best is None else "%.2f" % (1000 * best)))
+
+
+# Benchmarks que se pueden ejecutar por nombre: python -m mcts bench <suite> y python -m mcts_bench <suite>
+SUITES = {
+    'parallel': 'BenchmarkParallelUCT',
+    'tree-parallel': 'BenchmarkTreeParallelUCT',
+    'transpositions': 'BenchmarkTranspositions',
+    'memory': 'BenchmarkMemory',
+    'selection': 'BenchmarkSelection',
+    'rollouts': 'BenchmarkRollouts',
+    'undo': 'BenchmarkUndoMoves',
+    'policy': 'BenchmarkRolloutPolicy',
+    'symmetry': 'BenchmarkSymmetry',
+    'stats': 'BenchmarkSearchStats',
+    'export': 'BenchmarkTreeExport',
+    'variants': 'BenchmarkVariants',
+    'solver': 'BenchmarkSolver',
+    'rave': 'BenchmarkRave',
+    'widening': 'BenchmarkWidening',
+    'import': 'BenchmarkImportTime',
+}
@@ -0,0 +1,203 @@
+# Libro de aperturas: estadisticas de UCT precalculadas para las primeras posiciones, leidas con mmap.
+
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+
+from .game import BitboardConnect4State, Connect4State
+from .search import UCTSearch
+from .tree import Node
+
+
+BOOK_PATH = 'opening-book.bin'  # libro por defecto de PlayGame y build-book
+
+
+BOOK_HEADER = struct.Struct('<8sIII')  # magic, width, height, numero de entradas
+
+
+BOOK_MAGIC = b'C4BOOK01'
+
+
+class OpeningBook:
+    """ Libro de aperturas: estadisticas (wins, visits) de los nodos hijo de la raiz de UCT para
+        posiciones del principio de la partida, guardadas en disco por BuildOpeningBook.
+
+        El fichero es binario: una cabecera (BOOK_HEADER) y una entrada de tamanho fijo por posicion,
+        ordenadas por hash canonico (ver Connect4State.CanonicalHash): el hash (uint64) y width pares (visits uint32, wins float32),
+        uno por columna, desde el punto de vista del reflejo canonico. Se abre con mmap en modo solo lectura
+        y se busca con busqueda binaria, asi que no se carga en memoria y varios procesos
+        pueden leer el mismo fichero a la vez.
+    """
+
+    def __init__(self, path=BOOK_PATH):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.width, self.height, self.size = BOOK_HEADER.unpack_from(self.data, 0)
+        assert magic == BOOK_MAGIC, path + " no es un libro de aperturas"
+        self.entry = struct.Struct('<Q' + 'If' * self.width)
+
+    def Find(self, h):
+        """ Busqueda binaria del hash canonico h. Devuelve la entrada desempaquetada o None.
+        """
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = BOOK_HEADER.size + mid * self.entry.size
+            key = struct.unpack_from('<Q', self.data, offset)[0]
+            if key == h:
+                return self.entry.unpack_from(self.data, offset)
+            if key < h:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def Lookup(self, state):
+        """ Devuelve las estadisticas guardadas para state, ya en la orientacion de state,
+            o None si state no esta en el libro.
+
+            @output: (dict) move -> (wins, visits), solo los movimientos con alguna visita.
+        """
+        if (state.width, state.height, state.connect, state.numPlayers) != (self.width, self.height, 4, 2):
+            return None  # el libro es del 4 en raya normal
+        h, mirrored = state.CanonicalHash()
+        entry = self.Find(h)
+        if entry is None:
+            return None
+        stats = {}
+        for x in range(self.width):
+            visits, wins = entry[1 + 2 * x], entry[2 + 2 * x]
+            if visits > 0:
+                stats[self.width - 1 - x if mirrored else x] = (wins, visits)
+        return stats
+
+    def BestMove(self, state, minVisits=0):
+        """ Respuesta directa del libro: el movimiento con mayor ratio de victorias (como SelectMove),
+            si state esta en el libro con al menos minVisits simulaciones. Si no, None.
+        """
+        stats = self.Lookup(state)
+        if not stats or sum(v for (w, v) in stats.values()) < minVisits:
+            return None
+        return max(stats, key=lambda m: stats[m][0] / stats[m][1])
+
+    def PriorNode(self, state):
+        """ Nodo raiz para UCTSearch con las estadisticas del libro ya cargadas en sus nodos hijo,
+            como si la busqueda continuara una busqueda anterior (igual que MCTSPlayer). None si state no esta en el libro.
+        """
+        stats = self.Lookup(state)
+        if not stats:
+            return None
+        rootnode = Node(state=state)
+        for (m, (wins, visits)) in sorted(stats.items()):
+            if m not in rootnode.untriedMoves:
+                continue
+            st = state.Clone()
+            st.DoMove(m)
+            child = rootnode.AddChild(m, st)
+            child.wins, child.visits = wins, visits
+            rootnode.wins += visits - wins  # cada simulacion es una victoria para uno de los dos (o medio empate)
+            rootnode.visits += visits
+        return rootnode
+
+    def Entries(self):
+        """ Devuelve un diccionario hash canonico -> entrada desempaquetada con todo el libro.
+        """
+        return dict((e[0], e) for e in (self.entry.unpack_from(self.data, BOOK_HEADER.size + i * self.entry.size)
+                                        for i in range(self.size)))
+
+    def Close(self):
+        self.data.close()
+
+    def __len__(self):
+        return self.size
+
+
+def BookPositions(width, height, depth):
+    """ Enumera las posiciones no terminales con como mucho depth fichas, una por hash canonico.
+
+        @output: (list) tuplas (hash canonico, mirrored, lista de movimientos desde el tablero vacio)
+    """
+    positions = {}
+    frontier = [[]]
+    for d in range(depth + 1):
+        nextFrontier = []
+        for moves in frontier:
+            state = Connect4State(width=width, height=height)
+            for m in moves:
+                state.DoMove(m)
+            h, mirrored = state.CanonicalHash()
+            if h in positions or state.IsGameOver():
+                continue
+            positions[h] = (h, mirrored, moves)
+            nextFrontier.extend(moves + [m] for m in state.GetMoves())
+        frontier = nextFrontier
+    return sorted(positions.values())
+
+
+def BookWorker(job):
+    """ Busqueda de UCT para una posicion del libro (en un proceso del pool de BuildOpeningBook).
+
+        @output: (list) (wins, visits) de cada columna, en la orientacion de moves.
+    """
+    width, height, moves, itermax, seed = job
+    random.seed(seed)
+    state = BitboardConnect4State(width=width, height=height)
+    for m in moves:
+        state.DoMove(m)
+    rootnode = UCTSearch(state, itermax)
+    stats = [(0.0, 0)] * width
+    for c in rootnode.childNodes:
+        stats[c.move] = (c.wins, c.visits)
+    return stats
+
+
+def BuildOpeningBook(path=BOOK_PATH, depth=4, itermax=3000, width=7, height=6, workers=None, seed=0):
+    """ Construye (sin conexion, antes de jugar) el libro de aperturas: una busqueda de UCT con itermax iteraciones
+        para cada posicion con como mucho depth fichas, salvo reflejos. Las posiciones que ya estan en un
+        libro existente en path se conservan y no se vuelven a buscar, asi que el libro se puede ampliar
+        por partes (mas profundidad). El fichero nuevo se escribe aparte y se renombra al final:
+        los procesos que estan leyendo el libro anterior no ven nunca un fichero a medias.
+
+        @input workers: (int) procesos para las busquedas (por defecto, el numero de CPUs).
+
+        @output: (int) numero de entradas del libro.
+    """
+    import multiprocessing
+    entry = struct.Struct('<Q' + 'If' * width)
+    entries = {}
+    if os.path.exists(path):
+        old = OpeningBook(path)
+        if (old.width, old.height) == (width, height):
+            entries = old.Entries()
+        old.Close()
+
+    positions = [(h, mirrored, moves) for (h, mirrored, moves) in BookPositions(width, height, depth) if h not in entries]
+    jobs = [(width, height, moves, itermax, seed + i) for (i, (h, mirrored, moves)) in enumerate(positions)]
+    start = time.time()
+    pool = multiprocessing.Pool(workers)
+    try:
+        results = pool.map(BookWorker, jobs, chunksize=4)
+    finally:
+        pool.close()
+        pool.join()
+    for ((h, mirrored, moves), stats) in zip(positions, results):
+        if mirrored:
+            stats = stats[::-1]  # se guarda en la orientacion canonica
+        fields = [h]
+        for (wins, visits) in stats:
+            fields.extend([visits, wins])
+        entries[h] = tuple(fields)
+    print("%d posiciones nuevas (%d en total) en %.1fs" % (len(positions), len(entries), time.time() - start))
+
+    tmpPath = path + '.tmp'
+    with open(tmpPath, 'wb') as f:
+        f.write(BOOK_HEADER.pack(BOOK_MAGIC, width, height, len(entries)))
+        for h in sorted(entries):
+            f.write(entry.pack(*entries[h]))
+    if os.path.exists(path) and sys.platform == 'win32':
+        os.remove(path)  # en Windows os.rename no sobrescribe
+    os.rename(tmpPath, path)
+    return len(entries)
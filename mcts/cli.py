@@ -0,0 +1,174 @@
+# Linea de comandos del paquete: python -m mcts [comando], o el comando mcts si se instala el paquete (ver Main).
+# Todo lo que depende de la terminal esta aqui: la entrada del jugador humano y los colores (colorama, opcional).
+# Los demas modulos se importan dentro de cada comando, para que cada uno solo cargue lo que usa.
+
+import os
+import sys
+
+from .game import PLAYER_SYMBOLS
+from .search import MCTSPlayer, UCT
+
+PLAYER_COLORS = ['WHITE', 'RED', 'YELLOW', 'GREEN', 'CYAN', 'MAGENTA']  # color de colorama de cada simbolo de PLAYER_SYMBOLS
+
+
+def PlayGame(initialState, vsAI=False, itermax=3000, timeBudgetMs=None, reuseTree=False, book=None, solver=None,
+             render=str):
+    """ Play a sample game between two UCT players where each player gets a different number
+        of UCT iterations (= simulations = tree nodes).
+
+        @input itermax: (int) iteraciones de UCT por movimiento. None = sin limite (usar timeBudgetMs).
+        @input timeBudgetMs: (int) tiempo maximo de UCT por movimiento en milisegundos.
+        @input reuseTree: (bool) si es True, la IA es un MCTSPlayer que conserva el arbol entre movimientos.
+        @input book: (OpeningBook) libro de aperturas que la IA consulta antes de buscar (ver UCT).
+        @input solver: (EndgameSolver) MCTS-Solver para la IA (ver UCT). No se usa con reuseTree.
+        @input render: (function) convierte el estado en el texto que se imprime (ver ColorRenderer).
+    """
+    player = MCTSPlayer(itermax=itermax, timeBudgetMs=timeBudgetMs, verbose=True) if reuseTree else None
+    state = initialState
+    while not state.IsGameOver():  # while not terminal state
+        print(render(state))
+        if state.playerJustMoved % state.numPlayers + 1 == 2:
+            # JUGADOR 2
+            m = HumanInput(state)
+        else:
+            # JUGADOR 1
+            m = book.BestMove(state, minVisits=itermax or 0) if (book is not None and player is not None) else None
+            if m is not None:
+                print("Libro de aperturas: " + str(m))
+            elif player is not None:
+                m, iterations = player.Search(state)
+            else:
+                m, iterations = UCT(rootstate=state, itermax=itermax, verbose=True, timeBudgetMs=timeBudgetMs, book=book,
+                                    solver=solver)  # play with values for itermax and verbose = 2
+        state.DoMove(m)
+        if player is not None:
+            player.Advance(m)
+    PrintResults(state, render)
+
+
+def PrintResults(state, render=str):
+    """ Imprime los resultados de la partida una vez terminada
+        Esta funcion asume que la partida ya ha terminado
+    """
+    results = state.GetResults()
+    if 1 in results:
+        print(render(state))
+        print("Player " + str(results.index(1) + 1) + " wins!")
+    else:
+        print("Nobody wins!")
+
+
+def HumanInput(state):
+    """  Toma input para el juego desde standard input. Permite jugar a humanos.
+	 Haz nota de como los indices de las columans van de [0,6], pero el input se toma de [1,7]
+	 Esto se hace para que sea mas comodo jugar desde el teclado
+    """
+
+    valid_moves = state.GetMoves()
+    move = None
+    while move not in valid_moves:
+        interface_moves = [move + 1 for move in valid_moves]
+        move = int(input("Possible moves are: " + str(interface_moves) + ' '))
+        move -= 1
+    return move
+
+
+def ColorRenderer():
+    """ Funcion para el render de PlayGame que pinta la ficha de cada jugador de un color con colorama.
+        colorama solo se importa aqui: el resto del paquete no depende de la terminal.
+
+        @output render: (function) estado -> texto con colores, o str si colorama no esta instalado.
+    """
+    try:
+        import colorama
+    except ImportError:
+        return str
+    colorama.init()  # Necesario en Windows para los colores en la terminal
+    colors = dict((symbol, getattr(colorama.Fore, color) + symbol + colorama.Fore.RESET)
+                  for (symbol, color) in zip(PLAYER_SYMBOLS, PLAYER_COLORS))
+    return lambda state: "".join(colors.get(c, c) for c in str(state))
+
+
+def RunTests(parser, name):
+    """ Ejecuta tests/name con pytest. Los tests no forman parte del paquete: solo estan en una copia del repositorio.
+
+        @output: (int) codigo de salida de pytest.
+    """
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', name)
+    if not os.path.exists(path):
+        parser.error("no se encuentra %s: este comando solo funciona desde una copia del repositorio" % path)
+    try:
+        import pytest
+    except ImportError:
+        parser.error("este comando necesita pytest (pip install pytest)")
+    return pytest.main(['-q', '-s', path])
+
+
+def Main(argv=None):
+    """ Punto de entrada de la linea de comandos. Sin comando se juega una partida contra la IA.
+        Los comandos bench-<suite> de completo-MCTS.py siguen funcionando como alias de bench <suite>.
+
+        @input argv: (list) argumentos sin el nombre del programa. Por defecto, sys.argv[1:].
+
+        @output: (int) codigo de salida.
+    """
+    import argparse  # aqui y no al principio: quien solo importa PlayGame no necesita argparse (ver BenchmarkImportTime)
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0].startswith('bench-'):
+        argv[:1] = ['bench', argv[0][len('bench-'):]]
+    if not argv or argv[0].startswith('-'):
+        argv.insert(0, 'play')
+
+    parser = argparse.ArgumentParser(prog="mcts", description="MCTS-UCT para Connect4.")
+    commands = parser.add_subparsers(dest="command")
+    play = commands.add_parser("play", help="partida contra la IA (comando por defecto)")
+    play.add_argument("--itermax", type=int, default=3000, help="iteraciones de UCT por movimiento")
+    play.add_argument("--time-budget-ms", type=int, default=None, help="tiempo maximo de UCT por movimiento")
+    play.add_argument("--reuse-tree", action="store_true", help="la IA conserva el arbol entre movimientos")
+    play.add_argument("--width", type=int, default=7)
+    play.add_argument("--height", type=int, default=6)
+    play.add_argument("--connect", type=int, default=4, help="fichas en linea para ganar")
+    play.add_argument("--book", default=None, help="libro de aperturas (por defecto opening-book.bin si existe)")
+    play.add_argument("--no-solver", action="store_true", help="sin MCTS-Solver")
+    play.add_argument("--no-color", action="store_true", help="sin colores (colorama)")
+    commands.add_parser("parity", help="comprueba que BitboardConnect4State juega igual que Connect4State (tests/test_bitboard.py)")
+    bench = commands.add_parser("bench", help="ejecuta uno de los benchmarks (ver mcts.benchmarks.SUITES)")
+    bench.add_argument("suite")
+    export = commands.add_parser("export-tree", help="arbol de UCT desde el tablero vacio (ver ExportTree)")
+    export.add_argument("path", help="fichero .jsonl, .dot o .bin")
+    export.add_argument("itermax", type=int, nargs="?", default=3000)
+    commands.add_parser("check-memory", help="comprueba que NodeLimit limita la memoria residente (tests/test_node_limit.py)")
+    book = commands.add_parser("build-book", help="crea o completa el libro de aperturas (ver BuildOpeningBook)")
+    book.add_argument("depth", type=int, nargs="?", default=4, help="fichas de las posiciones del libro")
+    book.add_argument("itermax", type=int, nargs="?", default=3000)
+    args = parser.parse_args(argv)
+
+    if args.command == 'parity':
+        return RunTests(parser, 'test_bitboard.py')  # Comprueba que BitboardConnect4State juega igual que Connect4State
+    elif args.command == 'bench':
+        from . import benchmarks
+        if args.suite not in benchmarks.SUITES:
+            parser.error("benchmark desconocido: %s (%s)" % (args.suite, ", ".join(sorted(benchmarks.SUITES))))
+        getattr(benchmarks, benchmarks.SUITES[args.suite])()
+    elif args.command == 'export-tree':
+        from .export import ExportTree
+        from .game import BitboardConnect4State
+        from .search import UCTSearch
+        ExportTree(UCTSearch(BitboardConnect4State(width=7, height=6), args.itermax), args.path)
+    elif args.command == 'check-memory':
+        return RunTests(parser, 'test_node_limit.py')
+    elif args.command == 'build-book':
+        from .book import BuildOpeningBook
+        BuildOpeningBook(depth=args.depth, itermax=args.itermax)
+    else:
+        from .book import BOOK_PATH, OpeningBook
+        from .game import Connect4State
+        from .solver import EndgameSolver
+        bookPath = args.book or BOOK_PATH
+        book = OpeningBook(bookPath) if os.path.exists(bookPath) else None
+        solver = None if args.no_solver else EndgameSolver()
+        render = str if args.no_color else ColorRenderer()
+        PlayGame(Connect4State(width=args.width, height=args.height, connect=args.connect), itermax=args.itermax,
+                 timeBudgetMs=args.time_budget_ms, reuseTree=args.reuse_tree, book=book, solver=solver,
+                 render=render)  # Comienza el juego!
+    return 0
@@ -0,0 +1,127 @@
+# Exportar e importar el game tree (JSON Lines o binario) para inspeccionarlo fuera de Python.
+
+import json
+import os
+import struct
+
+from .tree import ArrayTree, Node
+
+
+TREE_MAGIC = b'MCTSTRE1'
+
+
+TREE_RECORD = struct.Struct('<ihHbdI')  # parent, move, depth, playerJustMoved, wins, visits: 21 bytes por nodo
+
+
+def WalkTree(root, minVisits=0, maxDepth=None):
+    """ Generador que recorre un game tree (Node o ArrayTree) en preorden, de forma iterativa:
+        no crea ninguna string ni lista con todo el arbol y no tiene limite de recursion.
+        Los nodos se numeran en el orden en el que salen (la raiz es 0). Los nodos con menos de minVisits visitas
+        o a mas de maxDepth de la raiz no salen, y tampoco su subarbol (la raiz siempre sale).
+
+        @output: (tuple) (id, parentId, depth, move, playerJustMoved, wins, visits) por nodo. parentId = -1 y move = -1 en la raiz.
+    """
+    isArray = isinstance(root, ArrayTree)
+    stack = [(0 if isArray else root, -1, 0)]
+    nextId = 0
+    while stack:
+        node, parentId, depth = stack.pop()
+        if isArray:
+            record = (nextId, parentId, depth, root.move[node], root.playerJustMoved[node], root.wins[node], root.visits[node])
+            children = list(root.Children(node))
+            visits = root.visits
+        else:
+            move = node.move if node.move is not None else -1
+            record = (nextId, parentId, depth, move, node.playerJustMoved, node.wins, node.visits)
+            children = node.childNodes
+        yield record
+        if maxDepth is None or depth < maxDepth:
+            for c in reversed(children):
+                if (visits[c] if isArray else c.visits) >= minVisits:
+                    stack.append((c, nextId, depth + 1))
+        nextId += 1
+
+
+def ExportTree(root, path, format=None, minVisits=0, maxDepth=None):
+    """ Escribe un game tree (Node o ArrayTree) en path nodo a nodo, a medida que WalkTree los recorre,
+        asi que la memoria no crece con el tamanho del arbol.
+
+        @input format: 'jsonl' (un objeto JSON por nodo), 'dot' (Graphviz, para visualizar: dot -Tsvg arbol.dot)
+                       o 'bin' (TREE_MAGIC y TREE_RECORD por nodo). Por defecto, la extension de path.
+        @input minVisits, maxDepth: poda (ver WalkTree).
+
+        @output: (int) numero de nodos escritos.
+    """
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip('.')
+    assert format in ('jsonl', 'dot', 'bin'), "Formato desconocido: " + str(format)
+    count = 0
+    with open(path, 'wb' if format == 'bin' else 'w') as f:
+        if format == 'bin':
+            f.write(TREE_MAGIC)
+        elif format == 'dot':
+            f.write("digraph mcts {\n    node [shape=box fontname=monospace];\n")
+        for (nodeId, parentId, depth, move, player, wins, visits) in WalkTree(root, minVisits, maxDepth):
+            if format == 'jsonl':  # a mano en vez de json.dumps, que es varias veces mas lento
+                f.write('{"id": %d, "parent": %d, "depth": %d, "move": %d, "playerJustMoved": %d, "wins": %r, "visits": %d}\n'
+                        % (nodeId, parentId, depth, move, player, wins, visits))
+            elif format == 'dot':
+                f.write('    n%d [label="M:%d\\nW/V:%g/%d"];\n' % (nodeId, move, wins, visits))
+                if parentId >= 0:
+                    f.write('    n%d -> n%d;\n' % (parentId, nodeId))
+            else:
+                f.write(TREE_RECORD.pack(parentId, move, depth, player, wins, visits))
+            count += 1
+        if format == 'dot':
+            f.write("}\n")
+    return count
+
+
+def ReadTree(path, format=None):
+    """ Generador que lee un arbol escrito por ExportTree en formato 'jsonl' o 'bin', nodo a nodo,
+        para analizarlo sin cargarlo entero en memoria.
+
+        @output: (tuple) los mismos campos que WalkTree.
+    """
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip('.')
+    assert format in ('jsonl', 'bin'), "Solo se pueden leer los formatos jsonl y bin"
+    if format == 'jsonl':
+        with open(path) as f:
+            for line in f:
+                n = json.loads(line)
+                yield (n["id"], n["parent"], n["depth"], n["move"], n["playerJustMoved"], n["wins"], n["visits"])
+        return
+    with open(path, 'rb') as f:
+        assert f.read(len(TREE_MAGIC)) == TREE_MAGIC, path + " no es un arbol exportado"
+        nodeId = 0
+        while True:
+            data = f.read(TREE_RECORD.size)
+            if len(data) < TREE_RECORD.size:
+                break
+            parentId, move, depth, player, wins, visits = TREE_RECORD.unpack(data)
+            yield (nodeId, parentId, depth, move, player, wins, visits)
+            nodeId += 1
+
+
+def LoadTree(path, format=None):
+    """ Reconstruye como objetos Node un arbol escrito por ExportTree (jsonl o bin). Los nodos no tienen
+        untriedMoves (no se guarda el estado), asi que sirven para analizar el arbol, no para seguir buscando.
+
+        @output rootnode: (Node)
+    """
+    nodes = []  # el padre de un nodo siempre sale antes que el nodo (preorden)
+    for (nodeId, parentId, depth, move, player, wins, visits) in ReadTree(path, format):
+        node = Node.__new__(Node)
+        node.move = move if parentId >= 0 else None
+        node.parentNode = nodes[parentId] if parentId >= 0 else None
+        node.childNodes = []
+        node.untriedMoves = []
+        node.playerJustMoved = player
+        node.wins = wins
+        node.visits = visits
+        node.proven = None
+        if node.parentNode is not None:
+            node.parentNode.childNodes.append(node)
+        nodes.append(node)
+    return nodes[0]
@@ -0,0 +1,527 @@
+# Juegos para MCTS-UCT: la interfaz GameState y Connect4 (connect-K, N jugadores) en listas y en bitboard.
+
+import bisect
+import random
+
+
+class GameState:
+    """
+        Un GameState representa una configuracion valida del 'estado' de un juego.
+        Por ejemplo, las posiciones de todas las piezas activas en una partida de ajedrez.
+        Las funciones presentadas en esta clase son las minimas necesarias
+        para la implementacion del algoritmo UCT para cualquier juego de numPlayers jugadores que se turnan (1, 2, ..., numPlayers, 1, ...).
+
+        Esta clase es una interfaz. Su uso es puramente ilustrativo. Trabajad con la clase Connect4State 
+    """
+
+    def __init__(self):
+        self.numPlayers = 2  # numero de jugadores
+        self.playerJustMoved = 2  # Al empezar el juego se considera que el ultimo jugador ha hecho un movimiento. Que es equivalente a decir que el jugador 1 empieza.
+
+    def Clone(self):
+        """ Crea una copia profunda del estado del juego.
+        """
+        st = GameState()
+        st.numPlayers = self.numPlayers
+        st.playerJustMoved = self.playerJustMoved
+        return st
+
+    def DoMove(self, move):
+        """ Transforma el GameState al llevar a cabo el movimiento 'move'.
+            Es importante que se actualize playerJustMoved, la variable que indica a quien le toca jugar.
+            El movimiento se guarda en moveStack para poder deshacerlo con UndoMove.
+
+            @input move: (int) accion tomada por el agente
+        """
+        self.playerJustMoved = self.playerJustMoved % self.numPlayers + 1  # con 2 jugadores, 3 - playerJustMoved
+
+    def UndoMove(self):
+        """ (Opcional) Deshace el ultimo movimiento de moveStack, dejando el GameState exactamente como estaba.
+            Permite que la busqueda use un unico GameState en vez de hacer Clone() en cada iteracion.
+        """
+
+    def GetMoves(self):
+        """ Devuelve una array con todos los posibles movimientos
+        """
+
+    def IsGameOver(self):
+        """ Devuelve True si la partida ha terminado. Equivale a GetMoves() == [], pero sin crear la lista.
+        """
+        return self.GetMoves() == []
+
+    def RandomMove(self):
+        """ Devuelve un movimiento posible escogido al azar (para las simulaciones). Equivale a random.choice(GetMoves()).
+        """
+        return random.choice(self.GetMoves())
+
+    def GetResult(self, playerJustMoved):
+        """ Devuelve el ganador de la partida desde el punto de vista de playerJustMoved.
+
+            @input playerJustMoved: (int) numero del jugador que acaba de tomar una accion.
+        """
+
+    def GetResults(self):
+        """ Vector de resultados de la partida terminada, uno por jugador: results[p - 1] = GetResult(p).
+            La retropropagacion lo pide una vez por iteracion en vez de llamar a GetResult en cada nodo.
+        """
+        return [self.GetResult(p) for p in range(1, self.numPlayers + 1)]
+
+    def IsSymmetric(self):
+        """ (Opcional) True si el estado es igual a su reflejo. En un estado simetrico, un movimiento y su reflejo
+            (MirrorMove) tienen el mismo valor y la busqueda puede tratarlos como uno solo (ver UCTSearch).
+        """
+        return False
+
+    def MirrorMove(self, move):
+        """ (Opcional) Devuelve el movimiento reflejado de move.
+        """
+        return move
+
+    def __repr__(self):
+        """ Funcion 'built in' de python. devuelve una string del objecto (como obj.toString() en Java)
+        """
+        pass
+
+
+ZOBRIST_KEYS = {}  # (width, height, players) -> claves de Zobrist, compartidas por todos los estados del mismo tamanho
+
+
+def ZobristKeys(width, height, players=2):
+    """ Devuelve (y genera la primera vez) las claves de Zobrist para un tablero width x height con players jugadores:
+        un entero aleatorio de 64 bits por cada casilla y jugador, keys[x][y][player - 1].
+        El hash de un tablero es el XOR de las claves de todas sus fichas, asi que se puede actualizar
+        en cada DoMove con un solo XOR. Se usa una semilla fija para que los hashes sean reproducibles.
+    """
+    if (width, height, players) not in ZOBRIST_KEYS:
+        rng = random.Random(width * 1000 + height)
+        ZOBRIST_KEYS[(width, height, players)] = [[[rng.getrandbits(64) for p in range(players)] for y in range(height)]
+                                                  for x in range(width)]
+    return ZOBRIST_KEYS[(width, height, players)]
+
+
+WIN_SHIFTS = {}  # (height, connect) -> desplazamientos de BitboardConnect4State.DoesBoardWin
+
+
+def WinShifts(height, connect):
+    """ Devuelve (y calcula la primera vez) los desplazamientos que usa BitboardConnect4State.DoesBoardWin
+        para buscar lineas de connect fichas: una tupla por direccion (vertical, horizontal y diagonales).
+        m & (m >> k*s) alarga las lineas marcadas en m de c a c + k fichas (k <= c), asi que para cada
+        direccion s basta con los pasos k*s que van doblando la longitud hasta llegar a connect.
+    """
+    if (height, connect) not in WIN_SHIFTS:
+        steps, length = [], 1
+        while length < connect:
+            k = min(length, connect - length)
+            steps.append(k)
+            length += k
+        WIN_SHIFTS[(height, connect)] = tuple(tuple(k * s for k in steps)
+                                              for s in (1, height + 1, height, height + 2))
+    return WIN_SHIFTS[(height, connect)]
+
+
+PLAYER_SYMBOLS = ['.', 'X', 'O', 'V', 'Z', 'W']
+
+
+class Connect4State:
+    """
+        GameState para el juego de 4 en Raya (Connect4 en ingles).
+        El tablero (board) es una array 2D (filas y columnas).
+        Para cada entrada de la array: 0 = vacio, 1 = jugador 1 (X), 2 = jugador 2 (O)
+        En el juego de 4 en Raya los jugadores se turnan para dejar caer piezas
+        en una de las 7 columnas, cada columna puede contener 6 piezas. El jugador que consigue
+        crear una fila, columna o diagonal con 4 piezas, gana.
+        Variantes: connect = longitud de la linea ganadora (p.ej. 5) y players = numero de jugadores (p.ej. 3, todos contra todos).
+    """
+
+    def __init__(self, width=7, height=6, connect=4, players=2):
+        self.numPlayers = players
+        self.playerJustMoved = players  # Al empezar el juego se considera que el ultimo jugador ha hecho un movimiento. Que es equivalente a decir que el jugador 1 empieza.
+        self.winner = 0 # 0 = ningun ganador, p = el jugador p ha ganado.
+
+        self.width = width
+        self.height = height
+        self.connect = connect  # fichas en linea para ganar
+        self.InitializeBoard()
+
+    def InitializeBoard(self):
+        """ Inicializa el tablero de juego, la representacion interna del estado del tablero.
+        """
+        self.board = []  # 0 = vacio, 1 = jugador 1 (X), 2 = jugador 2 (O)
+        for y in range(self.width):
+            self.board.append([0] * self.height) # Genera una fila de 0s. Generando un tablero vacio
+        self.heights = [0] * self.width  # numero de fichas en cada columna = primera fila libre
+        self.zobristKeys = ZobristKeys(self.width, self.height, self.numPlayers)
+        self.hash = 0  # hash de Zobrist del tablero, se actualiza en DoMove
+        self.mirrorHash = 0  # hash de Zobrist del reflejo del tablero (columna x <-> width - 1 - x)
+        self.moveStack = []  # movimientos hechos en este objeto, para UndoMove (Clone no los copia)
+        self.legalMoves = list(range(self.width))  # columnas con espacio libre, en orden. Se actualiza en DoMove
+        self.moveCount = 0  # numero de fichas en el tablero
+
+    def Clone(self):
+        """ Crea una copia profunda del este GameState. Usado en las simulaciones 
+            dado que el GameState de la simulacion tiene que ser diferente al GameState de la partida real.
+        """
+        st = Connect4State(width=self.width, height=self.height, connect=self.connect, players=self.numPlayers)
+        st.playerJustMoved = self.playerJustMoved
+        st.winner = self.winner
+        st.board = [self.board[col][:] for col in range(self.width)]
+        st.heights = self.heights[:]
+        st.hash = self.hash
+        st.mirrorHash = self.mirrorHash
+        st.legalMoves = self.legalMoves[:]
+        st.moveCount = self.moveCount
+        return st
+
+    def DoMove(self, movecol):
+        """ Transforma el GameState al llevar a cabo el movimiento 'movecol'.
+            Es importante que se actualize playerJustMoved.
+
+            @input movecol: (int) columna sobre la que se va a soltar la pieza.
+            @output void
+        """
+
+        assert movecol >= 0 and movecol <= self.width and self.board[movecol][self.height - 1] == 0
+        row = self.heights[movecol] # el primer espacio libre en la columna
+        self.heights[movecol] += 1
+
+        self.playerJustMoved = self.playerJustMoved % self.numPlayers + 1 # siguiente jugador
+        self.board[movecol][row] = self.playerJustMoved # coloca la ficha en la celda correcta
+        self.hash ^= self.zobristKeys[movecol][row][self.playerJustMoved - 1]
+        self.mirrorHash ^= self.zobristKeys[self.width - 1 - movecol][row][self.playerJustMoved - 1]
+        self.moveStack.append(movecol)
+        self.moveCount += 1
+        if row == self.height - 1:
+            self.legalMoves.remove(movecol) # la columna esta llena
+        if self.DoesMoveWin(movecol, row):
+            self.winner = self.playerJustMoved # apunta el ganador de la partida
+
+    def UndoMove(self):
+        """ Deshace el ultimo movimiento hecho con DoMove en este objeto: quita la ficha mas alta de su columna.
+            Si habia un ganador, lo habia hecho ese ultimo movimiento (la partida termina al ganar), asi que winner vuelve a 0.
+        """
+        movecol = self.moveStack.pop()
+        self.heights[movecol] -= 1
+        row = self.heights[movecol] # la ficha mas alta de la columna
+        self.hash ^= self.zobristKeys[movecol][row][self.playerJustMoved - 1]
+        self.mirrorHash ^= self.zobristKeys[self.width - 1 - movecol][row][self.playerJustMoved - 1]
+        self.board[movecol][row] = 0
+        self.moveCount -= 1
+        if row == self.height - 1:
+            bisect.insort(self.legalMoves, movecol) # la columna vuelve a tener espacio libre
+        self.winner = 0
+        self.playerJustMoved = (self.playerJustMoved - 2) % self.numPlayers + 1 # jugador anterior
+
+    def GetMoves(self):
+        """ Devuelve una array con todos los movimientos posibles - todas las columnas que tienen un espacio libre.
+        """
+        if self.winner != 0:
+            return [] # ningun movimiento posible dado que hay un ganador (in DoMove())
+        return self.legalMoves[:] # lista de columnas con espacio libre (copia, para que nadie modifique legalMoves)
+
+    def RandomMove(self):
+        """ Devuelve una columna con espacio libre escogida al azar, sin crear ninguna lista.
+            Solo tiene sentido si la partida no ha terminado (ver IsGameOver).
+        """
+        return self.legalMoves[int(random.random() * len(self.legalMoves))]
+
+    def DoesMoveWin(self, x, y):
+        """ Comprueba si el movimiento en la posicion (x,y) genera una linea (columna, fila o diagonal) de longitud connect (o mayor).
+            No hace falta entender esta funcion.
+
+            @input x: index de la columna
+            @input y: index de la fila
+
+            @output doesMoveWin: (boolean) True si el ultimo movimiento ha ganado la partida
+        """
+        me = self.board[x][y]
+        connect = self.connect
+        for (dx, dy) in [(0, +1), (+1, +1), (+1, 0), (+1, -1)]:
+            p = 1
+            while self.IsOnBoard(x+p*dx, y+p*dy) and self.board[x+p*dx][y+p*dy] == me:
+                p += 1
+            # (x+(p-1)*dx,y+(p-1)*dy) is the last counter of my colour in direction (dx,dy) starting from (x,y)
+
+            n = 1
+            while self.IsOnBoard(x-n*dx, y-n*dy) and self.board[x-n*dx][y-n*dy] == me:
+                n += 1
+            # (x-(n-1)*dx,y-(n-1)*dy) is the last counter of my colour in direction (-dx,-dy) starting from (x,y)
+
+            if p + n > connect: # want (p-1) + (n-1) + 1 >= connect, or more simply p + n > connect
+                return True
+
+        return False
+
+    def IsOnBoard(self, x, y):
+        return x >= 0 and x < self.width and y >= 0 and y < self.height
+
+    def GetCell(self, x, y):
+        """ Devuelve el contenido de la casilla (x, y): 0 = vacio, 1 = jugador 1 (X), 2 = jugador 2 (O)
+        """
+        return self.board[x][y]
+
+    def GetResult(self, playerJustMoved):
+        """ Devuelve el ganador de la partida desde el punto de vista de playerJustMoved.
+
+            @input playerJustMoved: (int) numero del jugador que acaba de tomar una accion.
+
+            @output: (int) 1 si el ultimo jugador en tomar una accion ha ganado la partida, 0 en cualquier otro caso.
+        """
+        return playerJustMoved == self.winner
+
+    def GetResults(self):
+        """ Vector de resultados (ver GameState.GetResults): 1 para el ganador, 0 para el resto.
+        """
+        results = [0] * self.numPlayers
+        if self.winner != 0:
+            results[self.winner - 1] = 1
+        return results
+
+    def IsGameOver(self):
+        """ True si hay un ganador o el tablero esta lleno (empate). O(1), sin llamar a GetMoves.
+        """
+        return self.winner != 0 or self.moveCount == self.width * self.height
+
+    def IsSymmetric(self):
+        """ True si el tablero es igual a su reflejo (columna x <-> width - 1 - x), p.ej. el tablero vacio.
+            Compara los dos hashes de Zobrist: O(1), y una colision de 64 bits es despreciable.
+        """
+        return self.hash == self.mirrorHash
+
+    def MirrorMove(self, movecol):
+        """ Devuelve la columna reflejada de movecol.
+        """
+        return self.width - 1 - movecol
+
+    def CanonicalHash(self):
+        """ Hash canonico: el menor entre el hash del tablero y el de su reflejo. Un tablero y su reflejo
+            tienen el mismo hash canonico (ver OpeningBook y TranspositionSearch).
+
+            @output: (tuple) (hash canonico, True si el hash canonico es el del reflejo)
+        """
+        if self.mirrorHash < self.hash:
+            return self.mirrorHash, True
+        return self.hash, False
+
+    def Canonical(self):
+        """ Forma canonica del estado: el propio estado o su reflejo (Mirror), el que tiene el hash canonico.
+        """
+        return self.Mirror() if self.CanonicalHash()[1] else self
+
+    def Mirror(self):
+        """ Devuelve una copia reflejada del estado (columna x <-> width - 1 - x). Como Clone(), sin moveStack.
+        """
+        st = self.Clone()
+        st.board.reverse()
+        st.heights.reverse()
+        st.hash, st.mirrorHash = self.mirrorHash, self.hash
+        st.legalMoves = [self.MirrorMove(m) for m in reversed(self.legalMoves)]
+        return st
+
+    def __repr__(self):
+        s = ""
+        for x in range(self.height - 1, -1, -1):
+            for y in range(self.width):
+                s += PLAYER_SYMBOLS[self.board[y][x]]
+            s += "\n"
+        return s
+
+
+class BitboardConnect4State:
+    """
+        GameState para el 4 en Raya con la misma interfaz que Connect4State, pero mucho mas rapido.
+        El tablero se guarda en un entero (bitboard) por jugador, mas la altura de cada columna.
+        La casilla (x, y) corresponde al bit x * (height + 1) + y. Cada columna tiene un bit extra
+        (siempre 0) encima de la ultima fila para que los desplazamientos no pasen de una columna a otra.
+    """
+
+    def __init__(self, width=7, height=6, connect=4, players=2):
+        self.numPlayers = players
+        self.playerJustMoved = players  # Al empezar el juego se considera que el ultimo jugador ha hecho un movimiento. Que es equivalente a decir que el jugador 1 empieza.
+        self.winner = 0 # 0 = ningun ganador, p = el jugador p ha ganado.
+
+        self.width = width
+        self.height = height
+        self.connect = connect  # fichas en linea para ganar
+        self.InitializeBoard()
+
+    def InitializeBoard(self):
+        """ Inicializa el tablero de juego: un bitboard vacio por jugador y todas las columnas a altura 0.
+        """
+        self.bitboards = [0] * self.numPlayers  # bitboards[p - 1] = fichas del jugador p
+        self.heights = [0] * self.width  # numero de fichas en cada columna
+        # Desplazamientos para buscar lineas: vertical, horizontal y las dos diagonales
+        self.shifts = (1, self.height + 1, self.height, self.height + 2)
+        self.winShifts = WinShifts(self.height, self.connect)
+        self.zobristKeys = ZobristKeys(self.width, self.height, self.numPlayers)
+        self.hash = 0  # mismo hash de Zobrist que Connect4State
+        self.mirrorHash = 0  # hash del reflejo del tablero
+        self.moveStack = []  # movimientos hechos en este objeto, para UndoMove (Clone no los copia)
+        self.legalMoves = list(range(self.width))  # columnas con espacio libre, en orden. Se actualiza en DoMove
+        self.moveCount = 0  # numero de fichas en el tablero
+
+    def Clone(self):
+        """ Crea una copia profunda del este GameState. Solo hay que copiar los bitboards y la lista de alturas.
+        """
+        st = BitboardConnect4State(width=self.width, height=self.height, connect=self.connect, players=self.numPlayers)
+        st.playerJustMoved = self.playerJustMoved
+        st.winner = self.winner
+        st.bitboards = self.bitboards[:]
+        st.heights = self.heights[:]
+        st.hash = self.hash
+        st.mirrorHash = self.mirrorHash
+        st.legalMoves = self.legalMoves[:]
+        st.moveCount = self.moveCount
+        return st
+
+    def DoMove(self, movecol):
+        """ Transforma el GameState al llevar a cabo el movimiento 'movecol'.
+            Es importante que se actualize playerJustMoved.
+
+            @input movecol: (int) columna sobre la que se va a soltar la pieza.
+            @output void
+        """
+        assert movecol >= 0 and movecol < self.width and self.heights[movecol] < self.height
+        self.playerJustMoved = self.playerJustMoved % self.numPlayers + 1 # siguiente jugador
+        b = self.bitboards[self.playerJustMoved - 1] | (1 << (movecol * (self.height + 1) + self.heights[movecol]))
+        self.bitboards[self.playerJustMoved - 1] = b
+        self.hash ^= self.zobristKeys[movecol][self.heights[movecol]][self.playerJustMoved - 1]
+        self.mirrorHash ^= self.zobristKeys[self.width - 1 - movecol][self.heights[movecol]][self.playerJustMoved - 1]
+        self.heights[movecol] += 1
+        self.moveStack.append(movecol)
+        self.moveCount += 1
+        if self.heights[movecol] == self.height:
+            self.legalMoves.remove(movecol) # la columna esta llena
+        if self.DoesBoardWin(b):
+            self.winner = self.playerJustMoved # apunta el ganador de la partida
+
+    def UndoMove(self):
+        """ Deshace el ultimo movimiento hecho con DoMove en este objeto (ver Connect4State.UndoMove).
+        """
+        movecol = self.moveStack.pop()
+        if self.heights[movecol] == self.height:
+            bisect.insort(self.legalMoves, movecol) # la columna vuelve a tener espacio libre
+        self.heights[movecol] -= 1
+        self.moveCount -= 1
+        self.bitboards[self.playerJustMoved - 1] ^= 1 << (movecol * (self.height + 1) + self.heights[movecol])
+        self.hash ^= self.zobristKeys[movecol][self.heights[movecol]][self.playerJustMoved - 1]
+        self.mirrorHash ^= self.zobristKeys[self.width - 1 - movecol][self.heights[movecol]][self.playerJustMoved - 1]
+        self.winner = 0
+        self.playerJustMoved = (self.playerJustMoved - 2) % self.numPlayers + 1 # jugador anterior
+
+    def GetMoves(self):
+        """ Devuelve una array con todos los movimientos posibles - todas las columnas que tienen un espacio libre.
+        """
+        if self.winner != 0:
+            return [] # ningun movimiento posible dado que hay un ganador (in DoMove())
+        return self.legalMoves[:]
+
+    def RandomMove(self):
+        """ Devuelve una columna con espacio libre escogida al azar, sin crear ninguna lista (ver Connect4State.RandomMove).
+        """
+        return self.legalMoves[int(random.random() * len(self.legalMoves))]
+
+    def DoesBoardWin(self, b):
+        """ Comprueba si el bitboard b contiene connect fichas seguidas en alguna direccion.
+            b & (b >> s) marca las fichas que tienen otra ficha a distancia s. Repitiendo con 2*s
+            quedan marcadas las lineas de 4. Para otros valores de connect se usan los pasos de WinShifts.
+
+            @input b: (int) bitboard de un jugador
+
+            @output: (boolean) True si hay una linea de connect (o mayor)
+        """
+        if self.connect == 4:  # caso normal, desenrollado
+            for s in self.shifts:
+                m = b & (b >> s)
+                if m & (m >> (2 * s)):
+                    return True
+            return False
+        for steps in self.winShifts:
+            m = b
+            for t in steps:
+                m &= m >> t
+            if m:
+                return True
+        return False
+
+    def DoesMoveWin(self, x, y):
+        """ Misma interfaz que Connect4State.DoesMoveWin: True si la ficha en (x, y) forma parte de una linea de 4.
+        """
+        player = self.GetCell(x, y)
+        return player != 0 and self.DoesBoardWin(self.bitboards[player - 1])
+
+    def GetCell(self, x, y):
+        """ Devuelve el contenido de la casilla (x, y): 0 = vacio, p = ficha del jugador p
+        """
+        bit = 1 << (x * (self.height + 1) + y)
+        for p in range(self.numPlayers):
+            if self.bitboards[p] & bit:
+                return p + 1
+        return 0
+
+    def GetResult(self, playerJustMoved):
+        """ Devuelve el ganador de la partida desde el punto de vista de playerJustMoved.
+
+            @input playerJustMoved: (int) numero del jugador que acaba de tomar una accion.
+
+            @output: (int) 1 si el ultimo jugador en tomar una accion ha ganado la partida, 0 en cualquier otro caso.
+        """
+        return playerJustMoved == self.winner
+
+    def GetResults(self):
+        """ Vector de resultados (ver GameState.GetResults): 1 para el ganador, 0 para el resto.
+        """
+        results = [0] * self.numPlayers
+        if self.winner != 0:
+            results[self.winner - 1] = 1
+        return results
+
+    def IsGameOver(self):
+        """ True si hay un ganador o el tablero esta lleno (empate). O(1), sin llamar a GetMoves.
+        """
+        return self.winner != 0 or self.moveCount == self.width * self.height
+
+    def IsSymmetric(self):
+        """ Ver Connect4State.IsSymmetric.
+        """
+        return self.hash == self.mirrorHash
+
+    def MirrorMove(self, movecol):
+        """ Devuelve la columna reflejada de movecol.
+        """
+        return self.width - 1 - movecol
+
+    def CanonicalHash(self):
+        """ Ver Connect4State.CanonicalHash.
+        """
+        if self.mirrorHash < self.hash:
+            return self.mirrorHash, True
+        return self.hash, False
+
+    def Canonical(self):
+        """ Forma canonica del estado: el propio estado o su reflejo (Mirror), el que tiene el hash canonico.
+        """
+        return self.Mirror() if self.CanonicalHash()[1] else self
+
+    def Mirror(self):
+        """ Devuelve una copia reflejada del estado: cada columna de bits pasa a la columna width - 1 - x.
+        """
+        st = self.Clone()
+        column = (1 << (self.height + 1)) - 1
+        for p in range(self.numPlayers):
+            b = 0
+            for x in range(self.width):
+                bits = (self.bitboards[p] >> (x * (self.height + 1))) & column
+                b |= bits << ((self.width - 1 - x) * (self.height + 1))
+            st.bitboards[p] = b
+        st.heights.reverse()
+        st.hash, st.mirrorHash = self.mirrorHash, self.hash
+        st.legalMoves = [self.MirrorMove(m) for m in reversed(self.legalMoves)]
+        return st
+
+    def __repr__(self):
+        s = ""
+        for x in range(self.height - 1, -1, -1):
+            for y in range(self.width):
+                s += PLAYER_SYMBOLS[self.GetCell(y, x)]
+            s += "\n"
+        return s
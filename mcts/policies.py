@@ -0,0 +1,182 @@
+# Politicas de simulacion (rollouts) y de expansion para UCTSearch.
+
+import random
+
+
+class RandomRolloutPolicy:
+    """ Interfaz de las politicas de simulacion (rollout policy) de UCTSearch: GetMove(state) devuelve
+        el movimiento que se juega en cada paso de la fase de simulacion.
+        Esta es la politica por defecto: un movimiento posible al azar.
+    """
+
+    def GetMove(self, state):
+        return state.RandomMove()
+
+
+THREAT_TABLES = {}  # (width, height, connect) -> (lines, cellLines, cellMasks), ver ThreatTables
+
+
+def ThreatTables(width, height, connect=4):
+    """ Devuelve (y genera la primera vez) las tablas de lineas ganadoras de un tablero width x height:
+            lines: lista de todas las lineas de connect casillas [(x, y), ...] (69 lineas de 4 en el tablero de 7 x 6).
+            cellLines[x][y]: las otras connect - 1 casillas de cada linea que pasa por (x, y).
+            cellMasks[x][y]: las mismas casillas como mascaras de bits con el formato de BitboardConnect4State.
+    """
+    if (width, height, connect) not in THREAT_TABLES:
+        lines = []
+        for x in range(width):
+            for y in range(height):
+                for (dx, dy) in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                    line = [(x + i * dx, y + i * dy) for i in range(connect)]
+                    if all(0 <= cx < width and 0 <= cy < height for (cx, cy) in line):
+                        lines.append(line)
+        cellLines = [[[] for y in range(height)] for x in range(width)]
+        cellMasks = [[[] for y in range(height)] for x in range(width)]
+        for line in lines:
+            for (cx, cy) in line:
+                others = [cell for cell in line if cell != (cx, cy)]
+                cellLines[cx][cy].append(others)
+                cellMasks[cx][cy].append(sum(1 << (ox * (height + 1) + oy) for (ox, oy) in others))
+        THREAT_TABLES[(width, height, connect)] = (lines, cellLines, cellMasks)
+    return THREAT_TABLES[(width, height, connect)]
+
+
+class Connect4ThreatPolicy:
+    """ Politica de simulacion con conocimiento del 4 en raya: si el jugador puede ganar en un movimiento, gana;
+        si no, si un rival gana con algun movimiento, lo bloquea; si no, juega al azar.
+        No recorre el tablero: para cada columna libre solo mira las lineas que pasan por su primera casilla libre,
+        usando las tablas precalculadas de ThreatTables. Con BitboardConnect4State cada linea es un AND con una mascara.
+    """
+
+    def __init__(self, width=7, height=6, connect=4):
+        self.lines, self.cellLines, self.cellMasks = ThreatTables(width, height, connect)
+
+    def GetMove(self, state):
+        me = state.playerJustMoved % state.numPlayers + 1
+        block = None
+        if hasattr(state, 'bitboards'):
+            mine = state.bitboards[me - 1]
+            theirs = [b for (p, b) in enumerate(state.bitboards) if p != me - 1]
+            heights = state.heights
+            for col in state.legalMoves:
+                for mask in self.cellMasks[col][heights[col]]:
+                    if mine & mask == mask:
+                        return col # gana
+                    for b in theirs:
+                        if b & mask == mask:
+                            block = col
+        else:
+            board = state.board
+            for col in state.legalMoves:
+                row = state.heights[col]
+                for line in self.cellLines[col][row]:
+                    (x0, y0) = line[0]
+                    owner = board[x0][y0]
+                    if owner != 0 and all(board[x][y] == owner for (x, y) in line):
+                        if owner == me:
+                            return col # gana
+                        block = col
+        if block is not None:
+            return block # bloquea la victoria del rival
+        return state.RandomMove()
+
+    def Threat(self, state, col):
+        """ Lo que consigue el jugador que mueve jugando en col: 2 = gana, 1 = bloquea una victoria del rival, 0 = nada.
+        """
+        me = state.playerJustMoved % state.numPlayers + 1
+        row = state.heights[col]
+        threat = 0
+        if hasattr(state, 'bitboards'):
+            for mask in self.cellMasks[col][row]:
+                for (p, b) in enumerate(state.bitboards):
+                    if b & mask == mask:
+                        if p == me - 1:
+                            return 2
+                        threat = 1
+        else:
+            board = state.board
+            for line in self.cellLines[col][row]:
+                (x0, y0) = line[0]
+                owner = board[x0][y0]
+                if owner != 0 and all(board[x][y] == owner for (x, y) in line):
+                    if owner == me:
+                        return 2
+                    threat = 1
+        return threat
+
+
+class RandomExpansion:
+    """ Interfaz de las estrategias de expansion de UCTSearch (expansion=...). Esta es la estrategia por defecto:
+        un nodo expande todos sus movimientos, escogidos al azar, antes de que la seleccion baje por sus hijos.
+          - OrderMoves(node, state): se llama al crear cada nodo, con el estado del nodo; puede reordenar node.untriedMoves.
+          - CanExpand(node): True si node tiene que expandir un movimiento nuevo en vez de seleccionar uno de sus hijos.
+          - NextMove(node): movimiento de node.untriedMoves que se expande.
+          - expandVisits: visitas que necesita un nodo para crear hijos (un nodo recibe su primera visita al crearse).
+            Con menos, la simulacion empieza en el propio nodo sin crear ninguno nuevo: con expandVisits = 2, las hojas
+            que solo se visitan una vez no tienen hijos.
+    """
+    expandVisits = 0
+
+    def OrderMoves(self, node, state):
+        pass
+
+    def CanExpand(self, node):
+        return node.untriedMoves != []
+
+    def NextMove(self, node):
+        return random.choice(node.untriedMoves)
+
+
+class CentrePrior:
+    """ Prior barato para ordenar la expansion: las columnas centrales primero (pasan por mas lineas ganadoras).
+        Scores(state, moves) devuelve un valor por movimiento; mayor = se expande antes.
+    """
+
+    def Scores(self, state, moves):
+        centre = state.width - 1
+        return [-abs(2 * m - centre) for m in moves]
+
+
+class ThreatPrior(CentrePrior):
+    """ Prior con amenazas inmediatas (ver Connect4ThreatPolicy.Threat): primero el movimiento que gana, despues
+        los que bloquean una victoria del rival y despues el resto, de las columnas centrales hacia los lados.
+    """
+
+    def __init__(self, width=7, height=6, connect=4):
+        self.policy = Connect4ThreatPolicy(width, height, connect)
+
+    def Scores(self, state, moves):
+        centre = state.width - 1
+        return [self.policy.Threat(state, m) * 2 * state.width - abs(2 * m - centre) for m in moves]
+
+
+class ProgressiveWidening(RandomExpansion):
+    """ Estrategia de expansion con progressive widening: un nodo con n visitas puede tener como mucho
+        MaxChildren(n) = widenConstant * (n + 1) ** widenExponent hijos (al menos 1). Mientras los tenga, la seleccion
+        sigue bajando por sus hijos aunque queden movimientos sin probar, asi que en tableros anchos las iteraciones
+        se concentran en pocos movimientos y no se crean nodos que casi no se visitan.
+        Los movimientos se ordenan con prior al crear el nodo y se expanden de mejor a peor (los empates, al azar).
+        Los movimientos sin expandir solo ocupan un entero en node.untriedMoves, y con expandVisits > 0 una hoja no crea
+        hijos hasta que tiene expandVisits visitas.
+    """
+
+    def __init__(self, prior=None, widenConstant=1.0, widenExponent=0.5, expandVisits=0):
+        self.prior = prior if prior is not None else CentrePrior()
+        self.widenConstant = widenConstant
+        self.widenExponent = widenExponent
+        self.expandVisits = expandVisits
+
+    def MaxChildren(self, visits):
+        return max(1, int(self.widenConstant * (visits + 1) ** self.widenExponent))
+
+    def OrderMoves(self, node, state):
+        moves = node.untriedMoves
+        random.shuffle(moves)
+        scores = dict(zip(moves, self.prior.Scores(state, moves)))
+        moves.sort(key=scores.__getitem__)  # el mejor al final; sort es estable, asi que los empates quedan al azar
+
+    def CanExpand(self, node):
+        return node.untriedMoves != [] and len(node.childNodes) < self.MaxChildren(node.visits)
+
+    def NextMove(self, node):
+        return node.untriedMoves[-1]
@@ -0,0 +1,888 @@
+# Las busquedas MCTS-UCT: UCT/UCTSearch y sus variantes (paralelas, con transposiciones, por lotes con NumPy).
+
+import collections
+import random
+import time
+
+from .backend import RequireNumpy
+from .tree import (ArrayTree, Node, NodeLimit, PROVEN_LOSS, PROVEN_NAMES, PROVEN_WIN, RaveNode, SharedNode, TranspositionNode,
+                   TranspositionTable, UpdateAmaf)
+
+
+class SearchStats:
+    """ Estadisticas de una busqueda de UCTSearch: se crea un SearchStats, se pasa como stats= a UCT o UCTSearch
+        y la busqueda lo rellena. Con stats=None (por defecto) la busqueda no mide nada.
+
+        iterations: iteraciones ejecutadas.
+        phaseSeconds: tiempo de cada una de las cuatro fases (seleccion, expansion, simulacion, retropropagacion).
+        nodes: nodos creados en la expansion.
+        maxDepth / AverageDepth(): profundidad del nodo al que llega cada iteracion (la raiz es 0).
+        rolloutLengths: longitud de simulacion -> numero de simulaciones con esa longitud.
+        rootVisitShares: movimiento -> fraccion de las visitas de la raiz que ha recibido su nodo hijo.
+
+        @input callback: funcion callback(stats) que se llama cada callbackEvery iteraciones (p.ej. para exportar metricas).
+    """
+
+    clock = staticmethod(time.perf_counter)  # reloj de alta resolucion
+
+    def __init__(self, callback=None, callbackEvery=1000):
+        self.callback = callback
+        self.callbackEvery = callbackEvery
+        self.iterations = 0
+        self.phaseSeconds = collections.OrderedDict((phase, 0.0) for phase in ["selection", "expansion", "simulation", "backpropagation"])
+        self.nodes = 0
+        self.maxDepth = 0
+        self.depthSum = 0
+        self.rolloutLengths = collections.Counter()
+        self.rootVisitShares = {}
+        self.seconds = 0.0
+
+    def RecordIteration(self, t0, t1, t2, t3, t4, depth, rolloutLength):
+        """ Apunta una iteracion: t0..t4 son los instantes (clock) entre las cuatro fases.
+        """
+        phases = self.phaseSeconds
+        phases["selection"] += t1 - t0
+        phases["expansion"] += t2 - t1
+        phases["simulation"] += t3 - t2
+        phases["backpropagation"] += t4 - t3
+        self.seconds += t4 - t0
+        self.iterations += 1
+        self.depthSum += depth
+        if depth > self.maxDepth:
+            self.maxDepth = depth
+        self.rolloutLengths[rolloutLength] += 1
+        if self.callback is not None and self.iterations % self.callbackEvery == 0:
+            self.callback(self)
+
+    def Finish(self, rootnode):
+        """ Calcula las fracciones de visitas de los nodos hijo de la raiz al terminar la busqueda.
+        """
+        if rootnode.visits > 0:
+            self.rootVisitShares = dict((c.move, c.visits / rootnode.visits) for c in rootnode.childNodes)
+
+    def AverageDepth(self):
+        return self.depthSum / self.iterations if self.iterations else 0.0
+
+    def AverageRolloutLength(self):
+        return sum(k * n for (k, n) in self.rolloutLengths.items()) / self.iterations if self.iterations else 0.0
+
+    def AsDict(self):
+        """ Todas las estadisticas en un diccionario (serializable con json).
+        """
+        return {"iterations": self.iterations, "seconds": self.seconds, "phaseSeconds": dict(self.phaseSeconds),
+                "nodes": self.nodes, "maxDepth": self.maxDepth, "averageDepth": self.AverageDepth(),
+                "rolloutLengths": dict((str(k), n) for (k, n) in sorted(self.rolloutLengths.items())),
+                "averageRolloutLength": self.AverageRolloutLength(),
+                "rootVisitShares": dict((str(m), share) for (m, share) in sorted(self.rootVisitShares.items()))}
+
+    def __repr__(self):
+        phases = " ".join("%s:%.3fs" % (phase, t) for (phase, t) in self.phaseSeconds.items())
+        shares = " ".join("%s:%.2f" % (m, share) for (m, share) in sorted(self.rootVisitShares.items()))
+        return ("[I:%d N:%d D:%d/%.1f R:%.1f %s | %s]" % (self.iterations, self.nodes, self.maxDepth, self.AverageDepth(),
+                                                        self.AverageRolloutLength(), phases, shares))
+
+
+def ArrayUCTSearch(rootstate, itermax=None, timeBudgetMs=None, checkEvery=64, exploration=1.0):
+    """ Mismo bucle que UCTSearch, pero el game tree es un ArrayTree en vez de objetos Node.
+        Con timeBudgetMs la busqueda termina al pasar el tiempo limite.
+
+        @output tree: (ArrayTree) game tree construido, la raiz es el nodo 0.
+    """
+    assert itermax is not None or timeBudgetMs is not None, "Hace falta itermax o timeBudgetMs"
+
+    tree = ArrayTree()
+    tree.AddNode(-1, -1, rootstate)
+    if timeBudgetMs is not None:
+        deadline = time.perf_counter() + timeBudgetMs / 1000
+
+    i = 0
+    while itermax is None or i < itermax:
+        if timeBudgetMs is not None and i % checkEvery == 0 and i > 0 and time.perf_counter() >= deadline:
+            break
+        i += 1
+
+        node = 0
+        state = rootstate.Clone()
+
+        # Seleccion
+        while tree.untried[node] == 0 and tree.firstChild[node] != -1:
+            node = tree.UCTSelectChild(node, exploration)
+            state.DoMove(tree.move[node])
+
+        # Expansion
+        if tree.untried[node] != 0:
+            m = random.choice(tree.UntriedMoves(node))
+            state.DoMove(m)
+            node = tree.AddNode(m, node, state)
+
+        # Simulacion
+        while not state.IsGameOver():
+            state.DoMove(state.RandomMove())
+
+        # Retropropagacion
+        results = state.GetResults()
+        while node != -1:
+            tree.Update(node, results[tree.playerJustMoved[node] - 1])
+            node = tree.parent[node]
+
+    return tree
+
+
+def UCT(rootstate, itermax=None, verbose=False, timeBudgetMs=None, compactTree=False, exploration=1.0, batchSize=None,
+        undoMoves=False, rolloutPolicy=None, book=None, bookMinVisits=None, symmetry=False, stats=None, maxNodes=None,
+        maxBytes=None, pruneTree=False, solver=None, rave=False, raveEquivalence=300, expansion=None):
+    """ Conduce una busqueda con el algoritmo MCTS-UCT durante itermax iteraciones empezando desde rootstate.
+        Assume 2 jugadores que se alternan, con resultados finales en el rango [0.0, 1.0].
+        Con timeBudgetMs la busqueda dura como mucho timeBudgetMs milisegundos (ver UCTSearch).
+
+        @input itermax: (int) numero de simulaciones (partidas) que se van a ejecutar antes de decidir que accion tomar.
+        @input verbose: False = no imprime nada; True = los nodos hijo de la raiz y, si los hay, el movimiento del libro
+                        o el resultado demostrado; 2 = ademas, el arbol entero en vez de solo los hijos.
+        @input timeBudgetMs: (int) tiempo maximo de busqueda en milisegundos. None = sin limite de tiempo.
+        @input compactTree: (bool) guarda el game tree en un ArrayTree (menos memoria) en vez de en objetos Node.
+                            Solo con itermax, timeBudgetMs y exploration: cualquier otra opcion da ValueError.
+        @input exploration: (float) constante de exploracion de UCB1 (ver Node.UCTSelectChild).
+        @input batchSize: (int) simula las hojas en lotes de batchSize con NumPy (ver BatchUCTSearch). Solo con itermax
+                          y exploration: cualquier otra opcion da ValueError.
+        @input undoMoves: (bool) un unico GameState con DoMove/UndoMove en vez de Clone() por iteracion (ver UCTSearch).
+        @input rolloutPolicy: politica de la fase de simulacion, p.ej. Connect4ThreatPolicy(). None = movimientos al azar.
+        @input book: (OpeningBook) se consulta antes de buscar. Si rootstate esta en el libro con al menos bookMinVisits
+                     simulaciones (por defecto itermax) se devuelve el movimiento del libro sin buscar (0 iteraciones);
+                     si tiene menos, sus estadisticas son el punto de partida de la busqueda.
+        @input symmetry: (bool) en las posiciones simetricas solo se busca uno de cada par de movimientos reflejados (ver UCTSearch).
+        @input stats: (SearchStats) se rellena con las estadisticas de la busqueda (ver UCTSearch). No se puede usar
+                      con compactTree ni con batchSize.
+        @input maxNodes, maxBytes: limite de nodos (o de memoria aproximada) del game tree. Al llegarle se dejan de
+                                   expandir nodos o, con pruneTree, se podan los subarboles menos visitados (ver NodeLimit).
+        @input solver: (EndgameSolver) MCTS-Solver: los nodos con resultado conocido no se vuelven a simular y los finales
+                       de partida se resuelven con negamax (ver UCTSearch). Si el resultado queda demostrado, se imprime.
+        @input rave: (bool) la seleccion mezcla el ratio de victorias con las estadisticas AMAF (ver RaveNode).
+        @input raveEquivalence: (float) visitas a partir de las cuales pesa mas el ratio de victorias que el AMAF.
+        @input expansion: estrategia de expansion, p.ej. ProgressiveWidening(ThreatPrior()). None = RandomExpansion.
+
+        @output move: (int) accion que llevar a cabo este turno.
+        @output iterations: (int) numero de iteraciones que se han ejecutado.
+    """
+
+    options = [('compactTree', compactTree), ('timeBudgetMs', timeBudgetMs is not None), ('undoMoves', undoMoves),
+               ('rolloutPolicy', rolloutPolicy is not None), ('book', book is not None), ('symmetry', symmetry),
+               ('stats', stats is not None), ('maxNodes', maxNodes is not None), ('maxBytes', maxBytes is not None),
+               ('pruneTree', pruneTree), ('solver', solver is not None), ('rave', rave), ('expansion', expansion is not None)]
+    if batchSize is not None:
+        if itermax is None:
+            raise ValueError("UCT(batchSize=...) necesita itermax")
+        unsupported = [name for (name, used) in options if used]
+        if unsupported:
+            raise ValueError("UCT(batchSize=...) no admite " + ", ".join(unsupported))
+    if compactTree:
+        unsupported = [name for (name, used) in options if used and name not in ('compactTree', 'timeBudgetMs')]
+        if unsupported:
+            raise ValueError("UCT(compactTree=True) no admite " + ", ".join(unsupported))
+
+    priorNode = None
+    if book is not None:
+        move = book.BestMove(rootstate, minVisits=bookMinVisits if bookMinVisits is not None else (itermax or 0))
+        if move is not None:
+            if verbose:
+                print("Libro de aperturas: " + str(move))
+            return move, 0
+        priorNode = book.PriorNode(rootstate)
+
+    if compactTree:
+        tree = ArrayUCTSearch(rootstate, itermax, timeBudgetMs=timeBudgetMs, exploration=exploration)
+        move = tree.SelectMove()
+        if verbose == 2:
+            print(tree.TreeToString())
+        elif verbose:
+            print(tree.ChildrenToString())
+        return move, tree.visits[0]
+
+    priorVisits = 0
+    if batchSize is not None:
+        rootnode = BatchUCTSearch(rootstate, itermax, batchSize=batchSize, exploration=exploration)
+    else:
+        if priorNode is not None:
+            priorVisits = priorNode.visits  # el libro ya cuenta como visitas de la raiz
+        nodeLimit = None
+        if maxNodes is not None or maxBytes is not None:
+            nodeLimit = NodeLimit(maxNodes, maxBytes, prune=pruneTree, rootstate=rootstate)
+        rootnode = UCTSearch(rootstate, itermax, timeBudgetMs=timeBudgetMs, rootnode=priorNode, exploration=exploration,
+                             undoMoves=undoMoves, rolloutPolicy=rolloutPolicy, symmetry=symmetry, stats=stats,
+                             nodeLimit=nodeLimit, solver=solver, rave=rave, raveEquivalence=raveEquivalence,
+                             expansion=expansion)
+
+    '''
+    part 1.3: fase Seleccion de accion
+    '''
+    move = SelectMove(rootnode)
+    for c in rootnode.childNodes:
+        if verbose and c.move == move and c.proven is not None:
+            print("Resultado demostrado: el jugador " + str(c.playerJustMoved) + " " + PROVEN_NAMES[c.proven])
+
+    # Output some information about the tree - can be omitted
+    if verbose == 2:
+        print(rootnode.TreeToString(0))
+    elif verbose:
+        print(rootnode.ChildrenToString())
+
+    return move, rootnode.visits - priorVisits  # la raiz recibe una visita por iteracion
+
+
+def UCTSearch(rootstate, itermax=None, timeBudgetMs=None, checkEvery=64, rootnode=None, exploration=1.0, useNumpy=False,
+              undoMoves=False, rolloutPolicy=None, symmetry=False, stats=None, nodeLimit=None, solver=None, rave=False,
+              raveEquivalence=300, expansion=None):
+    """ Construye el game tree de MCTS-UCT con itermax iteraciones empezando desde rootstate.
+        Es el bucle principal de UCT() sin la seleccion de accion final.
+        Con timeBudgetMs la busqueda termina al pasar el tiempo limite, o antes si el mejor
+        nodo hijo de la raiz ya no puede ser superado con las iteraciones que quedan (ver IsSearchDecided).
+        Si se dan itermax y timeBudgetMs, la busqueda termina con el primero de los dos limites.
+
+        @input itermax: (int) numero de simulaciones (partidas) que se van a ejecutar. None = sin limite.
+        @input timeBudgetMs: (int) tiempo maximo de busqueda en milisegundos. None = sin limite de tiempo.
+        @input checkEvery: (int) el reloj solo se mira cada checkEvery iteraciones, para que sea barato.
+        @input rootnode: (Node) arbol de una busqueda anterior desde rootstate para seguir construyendolo (ver MCTSPlayer).
+        @input exploration: (float) constante de exploracion de UCB1 (ver Node.UCTSelectChild).
+        @input useNumpy: (bool) selecciona con Node.UCTSelectChildNumpy (necesita NumPy). Solo para benchmarks: es mas lento.
+        @input undoMoves: (bool) usa un unico GameState para todas las iteraciones: al terminar cada iteracion
+                          se deshacen sus movimientos con UndoMove en vez de hacer Clone() (sin objetos nuevos por iteracion).
+        @input rolloutPolicy: politica de la fase de simulacion (ver RandomRolloutPolicy). None = movimientos al azar.
+        @input symmetry: (bool) en los nodos con un estado simetrico (GameState.IsSymmetric) un movimiento y su reflejo
+                         valen lo mismo: solo se expande uno de los dos (ver MergeMirroredMoves) y todas sus simulaciones
+                         van a un unico nodo hijo. Desde el tablero vacio la raiz tiene 4 hijos en vez de 7.
+        @input stats: (SearchStats) se rellena con el tiempo de cada fase, nodos, profundidad, etc. None = no se mide nada,
+                      y el coste es una comparacion con None por fase. La profundidad y la longitud de las simulaciones
+                      salen de state.moveStack, que solo contiene los movimientos de esta iteracion.
+        @input nodeLimit: (NodeLimit) limite de nodos del arbol. Se puede reutilizar entre busquedas del mismo arbol.
+        @input solver: (EndgameSolver) MCTS-Solver, solo para 2 jugadores. Cada nodo nuevo terminal, o con pocas casillas
+                       vacias (solver.maxEmpty), recibe su valor exacto (Node.proven) en vez de una simulacion, y el valor
+                       sube por el arbol (ver UpdateProven). La seleccion salta los nodos demostrados y la busqueda
+                       termina en cuanto el valor de la raiz queda demostrado.
+        @input rave: (bool) RAVE / AMAF: el arbol es de RaveNode, cada iteracion actualiza las estadisticas AMAF de todos
+                     los nodos del camino con los movimientos de la simulacion (ver UpdateAmaf) y la seleccion las mezcla
+                     con el ratio de victorias (ver RaveNode.RaveSelectChild). Mas informacion por iteracion: la misma
+                     fuerza con menos iteraciones. rootnode, si se da, tiene que ser un RaveNode.
+        @input raveEquivalence: (float) constante k de la mezcla de RaveNode.RaveSelectChild.
+        @input expansion: estrategia de expansion (ver RandomExpansion): decide cuando un nodo expande un movimiento
+                          nuevo en vez de seleccionar uno de sus hijos, y cual. None = el bucle normal de UCT, sin
+                          ninguna llamada extra (un nodo expande todos sus movimientos, al azar, antes de seleccionar).
+
+        @output rootnode: (Node) nodo raiz del game tree construido.
+    """
+    assert itermax is not None or timeBudgetMs is not None, "Hace falta itermax o timeBudgetMs"
+
+    if rootnode is None:
+        rootnode = RaveNode(state=rootstate) if rave else Node(state=rootstate)
+    if symmetry:
+        MergeMirroredMoves(rootnode, rootstate)
+    if expansion is not None and rootnode.visits == 0:
+        expansion.OrderMoves(rootnode, rootstate)
+    if useNumpy:
+        RequireNumpy("UCTSearch(useNumpy=True)")
+    selectChild = Node.UCTSelectChildNumpy if useNumpy else Node.UCTSelectChild
+    if solver is not None:
+        assert rootstate.numPlayers == 2, "MCTS-Solver solo funciona con 2 jugadores"
+        selectChild = Node.UCTSelectUnprovenChild
+    if rave:
+        assert isinstance(rootnode, RaveNode), "Con rave, rootnode tiene que ser un RaveNode"
+        selectChild = lambda node, exploration: node.RaveSelectChild(exploration, raveEquivalence)
+    workingState = rootstate.Clone() if undoMoves else None  # su moveStack empieza vacio
+    if timeBudgetMs is not None:
+        start = time.perf_counter()  # monotono: no le afectan los cambios de hora del sistema
+        deadline = start + timeBudgetMs / 1000
+
+    i = 0
+    while itermax is None or i < itermax:
+        if timeBudgetMs is not None and i % checkEvery == 0 and i > 0:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now > start:  # con un reloj poco preciso puede no haber avanzado todavia: no hay estimacion
+                remaining = int((deadline - now) * i / (now - start))  # iteraciones que caben en el tiempo que queda
+                if itermax is not None:
+                    remaining = min(remaining, itermax - i)
+                if IsSearchDecided(rootnode, remaining):
+                    break
+        if solver is not None and rootnode.proven is not None:
+            break  # resultado demostrado: no hace falta seguir buscando
+        i += 1
+        if nodeLimit is not None and nodeLimit.prune and nodeLimit.IsFull(rootnode):
+            nodeLimit.Prune(rootnode)  # antes de la seleccion: no se poda ningun nodo del camino de esta iteracion
+
+        node = rootnode
+        state = workingState if undoMoves else rootstate.Clone()
+        if stats is not None:
+            t0 = stats.clock()
+
+        '''
+        Part 1.1: Fase Seleccion
+        '''
+        if expansion is None:
+            while node.untriedMoves == [] and node.childNodes != []:  # Mientras el nodo este completamente expandido y non sea terminal
+                node = selectChild(node, exploration)
+                state.DoMove(node.move)
+        else:
+            while node.childNodes != [] and not expansion.CanExpand(node):
+                child = selectChild(node, exploration)
+                if child is None:
+                    break  # todos los hijos demostrados (solver): hay que expandir otro movimiento
+                node = child
+                state.DoMove(node.move)
+
+        if stats is not None:
+            t1 = stats.clock()
+
+        '''
+        part 1.2: fase expansion
+        '''
+        if node.untriedMoves != [] and (expansion is None or node.visits >= expansion.expandVisits):  # if we can expand (i.e. state/node is non-terminal)
+            m = random.choice(node.untriedMoves) if expansion is None else expansion.NextMove(node)
+            state.DoMove(m)
+            if nodeLimit is None:
+                child = node.AddChild(m, state)  # add child and descend tree
+            elif nodeLimit.IsFull(rootnode):
+                child = None  # arbol lleno: la simulacion empieza en node, con m como primer movimiento
+            else:
+                child = nodeLimit.AddChild(node, m, state)
+            if child is not None:
+                node = child
+                if symmetry:
+                    MergeMirroredMoves(node, state)
+                if expansion is not None:
+                    expansion.OrderMoves(node, state)
+                if solver is not None:
+                    node.proven = solver.Prove(state)
+                if stats is not None:
+                    stats.nodes += 1
+
+        if stats is not None:
+            t2 = stats.clock()
+            depth = len(state.moveStack)
+
+        '''
+        part 1.3: fase Simulacion
+        '''
+        proven = solver is not None and node.proven is not None  # resultado conocido: no hace falta simular
+        if proven:
+            pass
+        elif rolloutPolicy is None:
+            while not state.IsGameOver():  # while state is non-terminal
+                state.DoMove(state.RandomMove())
+        else:
+            while not state.IsGameOver():
+                state.DoMove(rolloutPolicy.GetMove(state))
+
+        if stats is not None:
+            t3 = stats.clock()
+
+        '''
+        part 1.3: fase Retropropagacion
+        '''
+        # Backpropagate
+        if proven:
+            results = ProvenResults(node)
+            UpdateProven(node)
+        else:
+            results = state.GetResults()  # un resultado por jugador
+        if rave:
+            UpdateAmaf(node, state, results)
+        while node is not None:  # backpropagate from the expanded node and work back to the root node
+            node.Update(results[node.playerJustMoved - 1])  # Update node with result from POV of node.playerJustMoved
+            node = node.parentNode
+
+        if stats is not None:
+            stats.RecordIteration(t0, t1, t2, t3, stats.clock(), depth, len(state.moveStack) - depth)
+
+        if undoMoves:
+            for k in range(len(state.moveStack)):
+                state.UndoMove()  # vuelve a rootstate
+
+    if stats is not None:
+        stats.Finish(rootnode)
+    return rootnode
+
+
+def MergeMirroredMoves(node, state):
+    """ Si state es simetrico, quita de node.untriedMoves el reflejo de cada movimiento (se queda el menor de cada par).
+        Los movimientos que ya tienen nodo hijo no se tocan.
+    """
+    if state.IsSymmetric():
+        node.untriedMoves = [m for m in node.untriedMoves if m <= state.MirrorMove(m)]
+
+
+def CanonicalMoves(state):
+    """ Movimientos de state en la orientacion canonica (ver Connect4State.CanonicalHash): reflejados si el hash
+        canonico es el del reflejo, y sin los reflejos repetidos si state es simetrico.
+    """
+    moves = state.GetMoves()
+    if state.IsSymmetric():
+        return [m for m in moves if m <= state.MirrorMove(m)]
+    if state.CanonicalHash()[1]:
+        return sorted(state.MirrorMove(m) for m in moves)
+    return moves
+
+
+def OrientMove(state, move):
+    """ Pasa move de la orientacion canonica de state a la de state (o al reves: reflejar dos veces no cambia nada).
+    """
+    return state.MirrorMove(move) if state.CanonicalHash()[1] else move
+
+
+def IsSearchDecided(rootnode, remaining):
+    """ Devuelve True si ningun nodo hijo de la raiz puede superar al mejor (el que escogeria SelectMove)
+        en las remaining iteraciones que quedan. Caso peor: todas las iteraciones que quedan son victorias
+        para el rival y derrotas para el mejor nodo.
+    """
+    if rootnode.untriedMoves != [] or rootnode.childNodes == []:
+        return False
+    best = max(rootnode.childNodes, key=lambda c: c.wins / c.visits)
+    worstBest = best.wins / (best.visits + remaining)
+    for c in rootnode.childNodes:
+        if c is not best and (c.wins + remaining) / (c.visits + remaining) >= worstBest:
+            return False
+    return True
+
+
+def SelectMove(rootnode):
+    """ Fase de seleccion de accion: devuelve el movimiento del nodo hijo de la raiz con mayor ratio de victorias.
+        Con valores demostrados (MCTS-Solver), un hijo que gana va siempre primero y uno que pierde, el ultimo.
+    """
+    return max(rootnode.childNodes, key=lambda c: (c.proven or 0, c.wins / c.visits)).move
+
+
+def ProvenResults(node):
+    """ Resultados (ver GameState.GetResults) de la partida cuyo valor demostrado es node.proven, con 2 jugadores.
+        Se retropropagan en lugar de los de una simulacion.
+    """
+    results = [0, 0]
+    if node.proven == PROVEN_WIN:
+        results[node.playerJustMoved - 1] = 1
+    elif node.proven == PROVEN_LOSS:
+        results[2 - node.playerJustMoved] = 1
+    return results
+
+
+def UpdateProven(node):
+    """ Sube el valor demostrado de node hacia la raiz con las reglas de MCTS-Solver. En el padre mueve el jugador
+        node.playerJustMoved, asi que:
+          - si algun hijo gana, el padre pierde (el jugador que mueve escoge ese hijo);
+          - si todos los movimientos estan expandidos y demostrados, el padre vale lo contrario del mejor hijo.
+        Se para en el primer padre que sigue sin demostrar.
+    """
+    parent = node.parentNode
+    while parent is not None and parent.proven is None:
+        if node.proven == PROVEN_WIN:
+            parent.proven = PROVEN_LOSS
+        elif parent.untriedMoves == [] and all(c.proven is not None for c in parent.childNodes):
+            parent.proven = -max(c.proven for c in parent.childNodes)
+        else:
+            return
+        node, parent = parent, parent.parentNode
+
+
+class MCTSPlayer:
+    """ Jugador MCTS-UCT que conserva el game tree entre movimientos.
+        Despues de cada movimiento de la partida (propio o del rival) se llama a Advance(move):
+        el nodo hijo correspondiente pasa a ser la nueva raiz y el resto del arbol se descarta.
+        Asi las simulaciones de turnos anteriores se aprovechan en el siguiente Search().
+        Con verbose=False (por defecto) no imprime nada; con verbose=True cada Search() imprime los nodos hijo
+        de la raiz, y con verbose=2 el arbol entero.
+    """
+
+    def __init__(self, itermax=3000, timeBudgetMs=None, verbose=False):
+        self.itermax = itermax
+        self.timeBudgetMs = timeBudgetMs
+        self.verbose = verbose
+        self.rootnode = None  # None = no hay arbol que reutilizar
+
+    def Search(self, state):
+        """ Continua la busqueda desde state reutilizando el arbol guardado (si corresponde a state)
+            y devuelve el mejor movimiento.
+
+            @input state: (GameState) estado actual de la partida.
+
+            @output move: (int) accion que llevar a cabo este turno.
+            @output iterations: (int) numero de iteraciones que se han ejecutado en esta llamada.
+        """
+        if not self.MatchesState(state):
+            self.rootnode = None
+        previousVisits = self.rootnode.visits if self.rootnode is not None else 0
+        self.rootnode = UCTSearch(state, self.itermax, timeBudgetMs=self.timeBudgetMs, rootnode=self.rootnode)
+        move = SelectMove(self.rootnode)
+
+        if self.verbose == 2:
+            print(self.rootnode.TreeToString(0))
+        elif self.verbose:
+            print(self.rootnode.ChildrenToString())
+
+        return move, self.rootnode.visits - previousVisits
+
+    def Advance(self, move):
+        """ Actualiza el arbol despues de que se juegue move en la partida. El nodo hijo de move
+            pasa a ser la raiz y se desconecta de su padre, para que el resto del arbol se pueda liberar.
+
+            @input move: (int) accion que se acaba de jugar.
+        """
+        if self.rootnode is None:
+            return
+        child = None
+        for c in self.rootnode.childNodes:
+            if c.move == move:
+                child = c
+                break
+        if child is not None:
+            child.parentNode = None
+        self.rootnode = child  # None si el movimiento nunca se habia expandido
+
+    def MatchesState(self, state):
+        """ Comprobacion barata de que la raiz guardada corresponde a state: mismo jugador
+            y mismos movimientos posibles.
+        """
+        if self.rootnode is None:
+            return False
+        moves = self.rootnode.untriedMoves + [c.move for c in self.rootnode.childNodes]
+        return self.rootnode.playerJustMoved == state.playerJustMoved and sorted(moves) == sorted(state.GetMoves())
+
+
+def ParallelUCT(rootstate, itermax, workers=None, seed=None, pool=None, verbose=False):
+    """ Root parallelization de MCTS-UCT: cada proceso construye su propio game tree desde rootstate,
+        con una semilla distinta, y al final se suman las estadisticas (wins/visits) de los nodos hijo
+        de la raiz de todos los arboles. La accion se escoge con las estadisticas sumadas.
+        rootstate tiene que poder serializarse con pickle (cualquier GameState de mcts.game puede).
+
+        @input itermax: (int) numero total de simulaciones, repartidas entre todos los procesos.
+        @input workers: (int) numero de procesos. Por defecto, uno por CPU.
+        @input seed: (int) semilla base. El proceso w usa seed + w. Por defecto, una semilla aleatoria.
+        @input pool: (multiprocessing.Pool) pool ya creado para no tener que crearlo en cada movimiento.
+
+        @output move: (int) accion que llevar a cabo este turno.
+    """
+    import multiprocessing  # aqui y no al principio del modulo: importarlo cuesta mas que todo el paquete
+    if workers is None:
+        workers = pool._processes if pool is not None else multiprocessing.cpu_count()
+    if seed is None:
+        seed = random.randint(0, 2 ** 31)
+
+    jobs = [(rootstate, itermax // workers + (1 if w < itermax % workers else 0), seed + w) for w in range(workers)]
+    if pool is None:
+        workerPool = multiprocessing.Pool(workers)
+        try:
+            results = workerPool.map(UCTWorker, jobs)
+        finally:
+            workerPool.close()
+            workerPool.join()
+    else:
+        results = pool.map(UCTWorker, jobs)
+
+    stats = {}  # move -> [wins, visits] sumados de todos los arboles
+    for result in results:
+        for (m, wins, visits) in result:
+            if m not in stats:
+                stats[m] = [0, 0]
+            stats[m][0] += wins
+            stats[m][1] += visits
+
+    moves = sorted(stats.keys())
+    move = max(moves, key=lambda m: stats[m][0] / stats[m][1])
+
+    if (verbose):
+        for m in moves:
+            print("[M:" + str(m) + " W/V:" + str(stats[m][0]) + "/" + str(stats[m][1]) + "]")
+
+    return move
+
+
+def UCTWorker(job):
+    """ Funcion que ejecuta cada proceso de ParallelUCT. Tiene que estar definida a nivel de modulo
+        para que multiprocessing pueda serializarla.
+
+        @input job: (tuple) (rootstate, itermax, seed)
+
+        @output: (list) una tupla (move, wins, visits) por cada nodo hijo de la raiz.
+    """
+    rootstate, itermax, seed = job
+    random.seed(seed)
+    rootnode = UCTSearch(rootstate, itermax)
+    return [(c.move, c.wins, c.visits) for c in rootnode.childNodes]
+
+
+def TreeParallelUCT(rootstate, itermax, threads=4, virtualLoss=3, verbose=False):
+    """ Tree parallelization de MCTS-UCT: varios threads hacen iteraciones sobre un unico game tree compartido.
+        Cada thread aplica una virtual loss a los nodos por los que baja, para que los demas threads
+        escojan otras ramas mientras su simulacion no haya terminado.
+        Nota: en CPython el GIL solo deja ejecutar codigo Python a un thread a la vez, con lo cual no hay
+        aceleracion en iteraciones por segundo; la ventaja aparece en interpretes sin GIL.
+
+        @input itermax: (int) numero total de simulaciones, repartidas entre todos los threads.
+        @input threads: (int) numero de threads.
+        @input virtualLoss: (int) derrotas virtuales por nodo mientras un thread pasa por el. 0 = sin virtual loss.
+
+        @output move: (int) accion que llevar a cabo este turno.
+    """
+    import threading
+    rootnode = SharedNode(state=rootstate, workers=threads)
+    workers = [threading.Thread(target=TreeParallelWorker,
+                                args=(rootnode, rootstate, itermax // threads + (1 if w < itermax % threads else 0), w, virtualLoss))
+               for w in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    rootnode.Consolidate()
+
+    move = SelectMove(rootnode)
+
+    if (verbose):
+        print(rootnode.ChildrenToString())
+
+    return move
+
+
+def TreeParallelWorker(rootnode, rootstate, itermax, worker, virtualLoss):
+    """ Bucle de iteraciones de un thread de TreeParallelUCT. Mismas fases que UCTSearch, pero la
+        expansion usa pop() (atomico) y cada nodo visitado recibe una virtual loss hasta la retropropagacion.
+    """
+    for i in range(itermax):
+        node = rootnode
+        state = rootstate.Clone()
+        node.AddVirtualLoss(worker, virtualLoss)
+
+        # Seleccion
+        while node.untriedMoves == [] and node.childNodes != []:
+            node = node.UCTSelectChild()
+            node.AddVirtualLoss(worker, virtualLoss)
+            state.DoMove(node.move)
+
+        # Expansion
+        try:
+            m = node.untriedMoves.pop()
+        except IndexError:
+            m = None  # otro thread ha expandido el ultimo movimiento, o el nodo es terminal
+        if m is not None:
+            state.DoMove(m)
+            child = SharedNode(move=m, parent=node, state=state, workers=len(rootnode.workerVisits))
+            child.AddVirtualLoss(worker, virtualLoss)
+            node.childNodes.append(child)
+            node = child
+
+        # Simulacion
+        while not state.IsGameOver():
+            state.DoMove(state.RandomMove())
+
+        # Retropropagacion
+        results = state.GetResults()
+        while node is not None:
+            node.Update(results[node.playerJustMoved - 1], worker, virtualLoss)
+            node = node.parentNode
+
+
+def TranspositionUCT(rootstate, itermax, maxNodes=1000000, verbose=False, symmetry=False, exploration=1.0):
+    """ MCTS-UCT con una tabla de transposiciones: las posiciones repetidas comparten un unico nodo
+        y sus estadisticas. rootstate tiene que tener un atributo hash (Connect4State y BitboardConnect4State lo tienen).
+
+        @input itermax: (int) numero de simulaciones (partidas) que se van a ejecutar antes de decidir que accion tomar.
+        @input maxNodes: (int) numero maximo de nodos en la tabla de transposiciones.
+        @input symmetry: (bool) la tabla se indexa por hash canonico: un tablero y su reflejo comparten nodo (ver TranspositionSearch).
+        @input exploration: (float) constante de exploracion de UCB1 (ver TranspositionNode.UCTSelectChild).
+
+        @output move: (int) accion que llevar a cabo este turno.
+        @output iterations: (int) numero de iteraciones que se han ejecutado.
+    """
+    table = TranspositionTable(maxNodes)
+    rootnode = TranspositionSearch(rootstate, itermax, table, symmetry, exploration)
+
+    children = [(move, table.Get(h)) for (move, h) in rootnode.childHashes.items()]
+    children = [(move, c) for (move, c) in children if c is not None]
+    move = max(children, key=lambda mc: mc[1].wins / mc[1].visits)[0]
+    if symmetry:
+        move = OrientMove(rootstate, move)
+
+    if (verbose):
+        for (m, c) in sorted(children, key=lambda mc: mc[0]):
+            print("[M:" + str(m) + " W/V:" + str(c.wins) + "/" + str(c.visits) + "]")
+
+    return move, rootnode.visits
+
+
+def TranspositionSearch(rootstate, itermax, table, symmetry=False, exploration=1.0):
+    """ Bucle principal de TranspositionUCT. Las mismas cuatro fases que UCTSearch, con dos diferencias:
+        en la expansion se busca primero el estado nuevo en la tabla, y como un nodo puede tener varios padres,
+        la retropropagacion recorre el camino guardado en esta iteracion (path) en vez de seguir parentNode.
+
+        Con symmetry la clave de la tabla es el hash canonico y los movimientos de cada nodo (untriedMoves,
+        childHashes) estan en la orientacion canonica: al bajar por el arbol se pasan a la orientacion
+        del estado con OrientMove. En los nodos simetricos solo hay uno de cada par de movimientos reflejados.
+
+        @output rootnode: (TranspositionNode) nodo raiz, que tambien esta en table.
+    """
+    Key = (lambda st: st.CanonicalHash()[0]) if symmetry else (lambda st: st.hash)
+    rootnode = table.Get(Key(rootstate))
+    if rootnode is None:
+        rootnode = TranspositionNode(rootstate)
+        if symmetry:
+            rootnode.untriedMoves = CanonicalMoves(rootstate)
+        table.Put(Key(rootstate), rootnode)
+
+    for i in range(itermax):
+        node = table.Get(Key(rootstate)) or rootnode  # Get() marca la raiz como usada para que nunca sea expulsada
+        state = rootstate.Clone()
+        path = [node]
+
+        # Seleccion
+        while node.untriedMoves == [] and node.childHashes:
+            move, child = node.UCTSelectChild(table, exploration)
+            if child is None:
+                break  # el hijo fue expulsado de la tabla: se vuelve a expandir
+            node = child
+            state.DoMove(OrientMove(state, move) if symmetry else move)
+            path.append(node)
+
+        # Expansion
+        if node.untriedMoves != []:
+            m = random.choice(node.untriedMoves)
+            state.DoMove(OrientMove(state, m) if symmetry else m)
+            node.untriedMoves.remove(m)
+            h = Key(state)
+            node.childHashes[m] = h
+            child = table.Get(h)
+            if child is None:
+                child = TranspositionNode(state)
+                if symmetry:
+                    child.untriedMoves = CanonicalMoves(state)
+                table.Put(h, child)
+            else:
+                table.hits += 1  # transposicion: la posicion ya estaba en el arbol
+            path.append(child)
+
+        # Simulacion
+        while not state.IsGameOver():
+            state.DoMove(state.RandomMove())
+
+        # Retropropagacion por el camino recorrido
+        results = state.GetResults()
+        for node in path:
+            node.Update(results[node.playerJustMoved - 1])
+
+    return rootnode
+
+
+def BatchRollout(states, rng=None):
+    """ Juega simulaciones aleatorias desde varios estados de 4 en raya a la vez con NumPy.
+        Los tableros se guardan en un array (N, width, height); en cada paso todas las partidas
+        que no han terminado hacen un movimiento aleatorio entre sus columnas libres (mascara de legales)
+        y se buscan lineas de 4 en todo el lote a la vez (ver BatchWins).
+        Todos los estados tienen que tener el mismo tamanho, connect y numero de jugadores y un metodo GetCell(x, y).
+
+        @input states: (list) estados desde los que simular. No se modifican.
+        @input rng: (numpy.random.RandomState) generador de numeros aleatorios.
+
+        @output winners: (numpy.ndarray) ganador de cada simulacion: 0 = empate, p = el jugador p gana.
+    """
+    np = RequireNumpy("BatchRollout")
+    if rng is None:
+        rng = np.random.RandomState(random.getrandbits(32))
+    n, width, height = len(states), states[0].width, states[0].height
+    connect, numPlayers = states[0].connect, states[0].numPlayers
+
+    boards = np.zeros((n, width, height), dtype=np.int8)  # 0 = vacio, p = jugador p
+    for i, state in enumerate(states):
+        for x in range(width):
+            for y in range(height):
+                boards[i, x, y] = state.GetCell(x, y)
+    heights = (boards != 0).sum(axis=2)  # (N, width): fichas en cada columna
+    toMove = np.array([state.playerJustMoved % numPlayers + 1 for state in states], dtype=np.int8)
+    winners = np.array([state.winner for state in states], dtype=np.int8)
+    active = (winners == 0) & (heights < height).any(axis=1)
+
+    while active.any():
+        idx = np.flatnonzero(active)
+        legal = heights[idx] < height
+        # argmax de valores aleatorios restringidos a las columnas legales = columna legal uniforme
+        cols = (rng.random_sample(legal.shape) * legal).argmax(axis=1)
+        rows = heights[idx, cols]
+        players = toMove[idx]
+        boards[idx, cols, rows] = players
+        heights[idx, cols] += 1
+
+        won = BatchWins(boards[idx] == players[:, None, None], connect)
+        winners[idx[won]] = players[won]
+        active[idx] = ~won & (heights[idx] < height).any(axis=1)
+        toMove[idx] = players % numPlayers + 1
+
+    return winners
+
+
+def BatchWins(pieces, connect=4):
+    """ Comprueba en todo un lote de tableros si hay alguna linea de connect fichas.
+            pieces: (numpy.ndarray) array booleano (N, width, height), True = ficha del jugador.
+        Para cada direccion se hace el AND de connect copias del tablero desplazadas (ventanas de connect casillas).
+
+        @output: (numpy.ndarray) array booleano (N,), True si el tablero tiene una linea de connect.
+    """
+    np = RequireNumpy("BatchWins")
+    w, h = pieces.shape[1], pieces.shape[2]
+    won = np.zeros(pieces.shape[0], dtype=bool)
+    for (dx, dy) in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+        xs, ys = w - (connect - 1) * dx, h - (connect - 1) * abs(dy)  # numero de ventanas en cada eje
+        if xs <= 0 or ys <= 0:
+            continue
+        y0 = connect - 1 if dy < 0 else 0
+        window = np.ones((pieces.shape[0], xs, ys), dtype=bool)
+        for i in range(connect):
+            window &= pieces[:, i * dx:i * dx + xs, y0 + i * dy:y0 + i * dy + ys]
+        won |= window.reshape(pieces.shape[0], -1).any(axis=1)
+    return won
+
+
+def BatchUCTSearch(rootstate, itermax, batchSize=64, exploration=1.0, virtualLoss=3):
+    """ UCTSearch con simulaciones en lote: se seleccionan y expanden batchSize hojas, se simulan todas
+        a la vez con BatchRollout, y despues se retropropagan los resultados.
+        Las hojas del mismo lote se escogen sin conocer los resultados de las demas. Para que no bajen todas
+        por el mismo camino, cada nodo del camino de una hoja recibe una virtual loss (visitas sin victorias,
+        como en TreeParallelWorker) que se quita al retropropagar el resultado de esa hoja.
+
+        @input batchSize: (int) numero de hojas que se simulan juntas.
+        @input exploration: (float) constante de exploracion de UCB1 (ver Node.UCTSelectChild).
+        @input virtualLoss: (int) derrotas virtuales por nodo mientras su hoja espera en el lote. 0 = sin virtual loss.
+
+        @output rootnode: (Node) nodo raiz del game tree construido.
+    """
+    np = RequireNumpy("BatchUCTSearch")
+    rng = np.random.RandomState(random.getrandbits(32))
+    rootnode = Node(state=rootstate)
+
+    done = 0
+    while done < itermax:
+        leaves, states = [], []
+        for b in range(min(batchSize, itermax - done)):
+            node = rootnode
+            state = rootstate.Clone()
+            node.visits += virtualLoss
+
+            # Seleccion
+            while node.untriedMoves == [] and node.childNodes != []:
+                node = node.UCTSelectChild(exploration)
+                node.visits += virtualLoss
+                state.DoMove(node.move)
+
+            # Expansion
+            if node.untriedMoves != []:
+                m = random.choice(node.untriedMoves)
+                state.DoMove(m)
+                node = node.AddChild(m, state)
+                node.visits += virtualLoss
+
+            leaves.append(node)
+            states.append(state)
+
+        # Simulacion de todo el lote
+        winners = BatchRollout(states, rng)
+
+        # Retropropagacion (mismo resultado que state.GetResult: 1 si gana playerJustMoved del nodo)
+        for node, winner in zip(leaves, winners):
+            while node is not None:
+                node.visits -= virtualLoss
+                node.Update(int(winner == node.playerJustMoved))
+                node = node.parentNode
+        done += len(leaves)
+
+    return rootnode
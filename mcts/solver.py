@@ -0,0 +1,96 @@
+# Solver exacto (negamax alfa-beta) para los finales de partida, usado por MCTS-Solver (ver UCTSearch).
+
+from .tree import PROVEN_DRAW, PROVEN_LOSS, PROVEN_WIN
+
+
+SOLVER_EXACT, SOLVER_LOWER, SOLVER_UPPER = 0, 1, 2  # tipo de valor de una entrada de la tabla de EndgameSolver
+
+
+class EndgameSolver:
+    """ Resuelve los finales de partida de Connect4State y BitboardConnect4State (2 jugadores) con negamax, poda
+        alfa-beta y su propia tabla de transposiciones (hash de Zobrist -> valor y tipo de cota).
+        Los valores son 1 (gana), 0 (tablas) y -1 (pierde), asi que la ventana alfa-beta es muy estrecha y las podas
+        llegan pronto. Los movimientos se ordenan del centro hacia los lados, despues de comprobar si alguno gana ya.
+        La tabla se conserva entre busquedas (p.ej. entre los movimientos de una partida) y se vacia al llegar a maxEntries.
+    """
+
+    def __init__(self, maxEmpty=12, maxEntries=1000000):
+        self.maxEmpty = maxEmpty  # solo se resuelven las posiciones con maxEmpty casillas vacias o menos
+        self.maxEntries = maxEntries
+        self.table = {}
+        self.nodes = 0  # posiciones visitadas por Negamax
+        self.solved = 0  # posiciones resueltas con Solve
+
+    def Prove(self, state):
+        """ Valor exacto de state desde el punto de vista de state.playerJustMoved (ver Node.proven),
+            o None si la partida no ha terminado y quedan mas de maxEmpty casillas vacias.
+        """
+        if state.winner != 0:
+            return PROVEN_WIN if state.winner == state.playerJustMoved else PROVEN_LOSS
+        empty = state.width * state.height - state.moveCount
+        if empty == 0:
+            return PROVEN_DRAW
+        if empty > self.maxEmpty:
+            return None
+        return -self.Solve(state)
+
+    def Solve(self, state):
+        """ Valor exacto de state para el jugador al que le toca mover: 1 gana, 0 tablas, -1 pierde.
+            Usa DoMove/UndoMove, asi que state vuelve a quedar como estaba.
+        """
+        self.solved += 1
+        if len(self.table) >= self.maxEntries:
+            self.table.clear()
+        centre = state.width - 1
+        self.order = sorted(range(state.width), key=lambda m: abs(2 * m - centre))
+        return self.Negamax(state, -1, 1)
+
+    def Negamax(self, state, alpha, beta):
+        self.nodes += 1
+        if state.winner != 0:
+            return -1  # ha ganado el jugador que acaba de mover
+        moves = state.GetMoves()
+        if not moves:
+            return 0  # tablero lleno
+        for m in moves:  # victoria inmediata
+            state.DoMove(m)
+            won = state.winner != 0
+            state.UndoMove()
+            if won:
+                return 1
+
+        entry = self.table.get(state.hash)
+        if entry is not None:
+            value, bound = entry
+            if bound == SOLVER_EXACT:
+                return value
+            if bound == SOLVER_LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        alphaOriginal = alpha
+        best = -1
+        for m in self.order:
+            if m not in moves:
+                continue
+            state.DoMove(m)
+            value = -self.Negamax(state, -beta, -alpha)
+            state.UndoMove()
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best <= alphaOriginal:
+            bound = SOLVER_UPPER
+        elif best >= beta:
+            bound = SOLVER_LOWER
+        else:
+            bound = SOLVER_EXACT
+        self.table[state.hash] = (best, bound)
+        return best
@@ -0,0 +1,622 @@
+# El game tree de MCTS-UCT: Node y sus variantes (RaveNode, SharedNode, ArrayTree, TranspositionNode),
+# los valores demostrados de MCTS-Solver y el limite de memoria NodeLimit.
+
+import array
+import collections
+import random
+import sys
+from math import log, sqrt
+
+from .backend import RequireNumpy
+
+
+PROVEN_WIN, PROVEN_DRAW, PROVEN_LOSS = 1, 0, -1  # valores demostrados de Node.proven (MCTS-Solver)
+
+
+PROVEN_NAMES = {PROVEN_WIN: "gana", PROVEN_DRAW: "tablas", PROVEN_LOSS: "pierde"}
+
+
+class Node:
+    """ Un nodo del game treee. self.wins siempre esta desde el punto de vista de playerJustMoved. (aclarar)
+        __slots__ evita el __dict__ de cada nodo: los arboles grandes ocupan mucha menos memoria.
+        Para arboles muy grandes ver ArrayTree.
+        proven es el valor exacto del nodo cuando se conoce (MCTS-Solver, ver UCTSearch con solver):
+        PROVEN_WIN, PROVEN_DRAW o PROVEN_LOSS desde el punto de vista de playerJustMoved. None = desconocido.
+    """
+    __slots__ = ('move', 'parentNode', 'childNodes', 'wins', 'visits', 'untriedMoves', 'playerJustMoved', 'proven')
+
+    def __init__(self, move=None, parent=None, state=None):
+        self.move = move  # el move que se hizo en un state previo para llegar a este estado. "None" para el nodo raiz.
+        self.parentNode = parent  # "None" para el nodo raiz
+        self.childNodes = []
+        self.wins = 0
+        self.visits = 0
+        self.untriedMoves = state.GetMoves()  # Futuros nodos hijo
+        self.playerJustMoved = state.playerJustMoved  # the only part of the state that the Node needs later
+        self.proven = None
+
+    def UCTSelectChild(self, exploration=1.0):
+        """ Usa la formula de UCB1 para seleccionar uno de los nodos hijo:
+                lambda child: child.wins/child.visits + const * sqrt(2*log(self.visits)/child.visits)
+            la constante se usa para escoger entre exploracion o explotacion.
+            Una sola pasada por los hijos (argmax) y log(self.visits) se calcula una vez.
+            Un hijo sin visitas tiene valor infinito, asi que se devuelve directamente.
+
+            @input exploration: (float) la constante const de la formula.
+        """
+        c2LogVisits = 2 * log(self.visits) if self.visits > 0 else 0.0  # sin visitas, todos los hijos tienen 0 visitas
+        best, bestScore = None, -1.0
+        for c in self.childNodes:
+            if c.visits == 0:
+                return c
+            score = c.wins / c.visits + exploration * sqrt(c2LogVisits / c.visits)
+            if score > bestScore:
+                best, bestScore = c, score
+        return best
+
+    def UCTSelectChildNumpy(self, exploration=1.0):
+        """ Igual que UCTSelectChild, pero calcula el valor UCB1 de todos los hijos a la vez con NumPy (ver UCB1Argmax).
+            Solo para comparar en BenchmarkSelection: copia las estadisticas de los hijos a arrays en cada llamada,
+            y esa copia cuesta mas que el bucle de UCTSelectChild, que es lo que usan las busquedas.
+        """
+        np = RequireNumpy("Node.UCTSelectChildNumpy")
+        k = len(self.childNodes)
+        wins = np.fromiter((c.wins for c in self.childNodes), dtype=np.float64, count=k)
+        visits = np.fromiter((c.visits for c in self.childNodes), dtype=np.float64, count=k)
+        return self.childNodes[UCB1Argmax(wins, visits, self.visits, exploration)]
+
+    def UCTSelectUnprovenChild(self, exploration=1.0):
+        """ Igual que UCTSelectChild, pero sin los hijos con valor demostrado (proven): su resultado ya se conoce
+            y no hace falta simularlos mas. Devuelve None si todos los hijos estan demostrados.
+        """
+        c2LogVisits = 2 * log(self.visits) if self.visits > 0 else 0.0
+        best, bestScore = None, -1.0
+        for c in self.childNodes:
+            if c.proven is not None:
+                continue
+            if c.visits == 0:
+                return c
+            score = c.wins / c.visits + exploration * sqrt(c2LogVisits / c.visits)
+            if score > bestScore:
+                best, bestScore = c, score
+        return best
+
+    def AddChild(self, move, state):
+        """ Quita move de la array untriedMoves y anhade un nuevo nodo hijo para este movimiento
+            se devuelve el nodo hijo que se ha anhadido.
+
+            @input move: (int) accion tomada por el agente
+            @input state: (GameState) estado correspondiente al nuevo nodo hijo (childNode)
+
+            @output node
+        """
+        node = Node(move=move, parent=self, state=state)
+        self.untriedMoves.remove(move)
+        self.childNodes.append(node)
+        return node
+
+    def Recycle(self, move, parent, state):
+        """ Reinicia un nodo que ya no esta en el arbol para usarlo como un nodo nuevo (ver NodeLimit).
+            Reutiliza su lista childNodes.
+        """
+        self.move = move
+        self.parentNode = parent
+        del self.childNodes[:]
+        self.wins = 0
+        self.visits = 0
+        self.untriedMoves = state.GetMoves()
+        self.playerJustMoved = state.playerJustMoved
+        self.proven = None
+
+    def Update(self, result):
+        """ Actualiza las estadisticas guardadas en este nodo.
+            Anhade una visita al contador de visitas del nodo, anhade el resultado (win/lose) desde el punto de vista del playerJustMoved
+            One additional visit and result additional wins. Result must be from the viewpoint of playerJustmoved.
+
+            @input result: (int) 1 denota victoria, 0 para el resto de los casos.
+            @output void
+        """
+        self.visits += 1
+        self.wins += result
+
+    """ Funciones para debuggear y modo verbose
+    """
+    def __repr__(self):
+        return "[M:" + str(self.move) + " W/V:" + str(self.wins) + "/" + str(self.visits) + " U:" + str(
+            self.untriedMoves) + ("" if self.proven is None else " P:" + PROVEN_NAMES[self.proven]) + "]"
+
+    def TreeToString(self, indent):
+        """ Todo el arbol, un nodo por linea. Iterativo (sin limite de recursion) y con un solo join,
+            asi que es lineal en el numero de nodos.
+        """
+        lines = []
+        stack = [(self, indent)]
+        while stack:
+            node, depth = stack.pop()
+            lines.append(node.IndentString(depth) + str(node))
+            stack.extend((c, depth + 1) for c in reversed(node.childNodes))
+        return "".join(lines)
+
+    def IndentString(self, indent):
+        return "\n" + "| " * indent
+
+    def ChildrenToString(self):
+        s = ""
+        for c in self.childNodes:
+            s += str(c) + "\n"
+        return s
+
+
+class NodeLimit:
+    """ Limite de memoria del game tree de UCTSearch: como mucho maxNodes objetos Node (ver UCTSearch, nodeLimit=).
+        Con maxBytes, maxNodes se estima con sys.getsizeof de un nodo de rootstate (ver NodeBytes).
+
+        Al llegar al limite hay dos comportamientos:
+        - prune=False: no se expanden mas nodos. Las iteraciones siguen mejorando las estadisticas
+          de los nodos que ya hay (la simulacion empieza en el nodo seleccionado).
+        - prune=True: se podan los subarboles con menos visitas (nunca los hijos de la raiz) hasta dejar
+          el arbol en keepFraction * maxNodes nodos. Sus movimientos vuelven a untriedMoves del padre, y
+          los objetos Node van a una free list para reutilizarlos en las siguientes expansiones
+          en vez de crear objetos nuevos. Las estadisticas de los nodos que quedan no cambian.
+    """
+
+    def __init__(self, maxNodes=None, maxBytes=None, prune=False, keepFraction=0.5, rootstate=None):
+        assert maxNodes is not None or maxBytes is not None, "Hace falta maxNodes o maxBytes"
+        if maxBytes is not None:
+            maxNodes = min(maxNodes or maxBytes, maxBytes // NodeBytes(rootstate))
+        self.maxNodes = max(2, maxNodes)
+        self.prune = prune
+        self.keepFraction = keepFraction
+        self.count = None  # nodos del arbol; None = se cuentan la primera vez (el arbol puede venir de otra busqueda)
+        self.freeNodes = []
+        self.pruned = 0  # nodos podados en total
+
+    def IsFull(self, rootnode):
+        if self.count is None:
+            self.count = CountNodes(rootnode)
+        return self.count >= self.maxNodes
+
+    def AddChild(self, node, move, state):
+        """ Igual que Node.AddChild, pero reutiliza un nodo de la free list si hay alguno.
+            Devuelve None (y no anhade nada) si el arbol esta lleno.
+        """
+        if self.count >= self.maxNodes:
+            return None
+        self.count += 1
+        if not self.freeNodes:
+            return node.AddChild(move, state)
+        child = self.freeNodes.pop()
+        child.Recycle(move, node, state)
+        node.untriedMoves.remove(move)
+        node.childNodes.append(child)
+        return child
+
+    def Prune(self, rootnode):
+        """ Poda los subarboles con menos visitas hasta dejar como mucho keepFraction * maxNodes nodos.
+            Como un nodo nunca tiene mas visitas que su padre, se busca el umbral de visitas que libera
+            suficientes nodos y se cortan los nodos mas altos del arbol que no llegan al umbral.
+
+            @output: (int) numero de nodos podados.
+        """
+        visits = []
+        stack = list(rootnode.childNodes)  # los hijos de la raiz no se podan: SelectMove los necesita
+        while stack:
+            node = stack.pop()
+            for c in node.childNodes:
+                visits.append(c.visits)
+                stack.append(c)
+        target = self.count - int(self.maxNodes * self.keepFraction)
+        if target <= 0 or not visits:
+            return 0
+        visits.sort()
+        threshold = visits[min(target, len(visits)) - 1]
+
+        freed = 0
+        stack = list(rootnode.childNodes)
+        while stack:
+            node = stack.pop()
+            kept = []
+            for c in node.childNodes:
+                if c.visits <= threshold:
+                    node.untriedMoves.append(c.move)  # se puede volver a expandir
+                    freed += self.Free(c)
+                else:
+                    kept.append(c)
+                    stack.append(c)
+            node.childNodes[:] = kept
+        self.count -= freed
+        self.pruned += freed
+        return freed
+
+    def Free(self, subtree):
+        """ Desconecta todos los nodos de subtree y los pasa a la free list. Devuelve cuantos son.
+        """
+        freed = 0
+        stack = [subtree]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.childNodes)
+            del node.childNodes[:]
+            node.parentNode = None
+            node.untriedMoves = []
+            self.freeNodes.append(node)
+            freed += 1
+        return freed
+
+
+def NodeBytes(state):
+    """ Estimacion de la memoria de un Node de state: el objeto, sus dos listas y su referencia en childNodes del padre.
+    """
+    node = Node(state=state)
+    return sys.getsizeof(node) + sys.getsizeof(node.childNodes) + sys.getsizeof(node.untriedMoves) + 8
+
+
+def UCB1Argmax(wins, visits, parentVisits, exploration=1.0):
+    """ Indice del valor UCB1 maximo a partir de arrays contiguos de NumPy con las victorias y visitas de los hijos.
+        Los hijos sin visitas tienen valor infinito (el primero de ellos gana).
+        Ninguna busqueda lo usa: los hijos de un nodo no estan contiguos en memoria (ni en Node ni en ArrayTree,
+        donde son una lista enlazada), asi que habria que copiarlos antes. Se mide en BenchmarkSelection.
+
+        @input wins: (numpy.ndarray) victorias de cada hijo.
+        @input visits: (numpy.ndarray) visitas de cada hijo.
+        @input parentVisits: (int) visitas del nodo padre.
+
+        @output: (int) indice del hijo seleccionado.
+    """
+    np = RequireNumpy("UCB1Argmax")
+    unvisited = np.flatnonzero(visits == 0)
+    if len(unvisited) > 0:
+        return int(unvisited[0])
+    scores = wins / visits + exploration * np.sqrt(2 * log(parentVisits) / visits)
+    return int(np.argmax(scores))
+
+
+class RaveNode(Node):
+    """ Nodo con estadisticas RAVE / AMAF (all-moves-as-first) ademas de wins y visits (ver UCTSearch con rave).
+        amafWins[m] y amafVisits[m] cuentan las simulaciones que han pasado por este nodo en las que el jugador que mueve
+        aqui puso una ficha en algun momento posterior (en el arbol o en la simulacion) en la casilla donde caeria m,
+        como si hubiera jugado m primero. Se compara la casilla y no la columna: la misma columna unas filas mas arriba
+        es otra jugada.
+        Son listas indexadas por movimiento, asi que cubren a todos los hijos, incluidos los que aun no se han expandido.
+    """
+    __slots__ = ('amafWins', 'amafVisits')
+
+    def __init__(self, move=None, parent=None, state=None):
+        Node.__init__(self, move=move, parent=parent, state=state)
+        size = max(self.untriedMoves) + 1 if self.untriedMoves else 0
+        self.amafWins = [0] * size
+        self.amafVisits = [0] * size
+
+    def AddChild(self, move, state):
+        """ Igual que Node.AddChild, pero el hijo tambien es un RaveNode.
+        """
+        node = RaveNode(move=move, parent=self, state=state)
+        self.untriedMoves.remove(move)
+        self.childNodes.append(node)
+        return node
+
+    def Recycle(self, move, parent, state):
+        Node.Recycle(self, move, parent, state)
+        size = max(self.untriedMoves) + 1 if self.untriedMoves else 0
+        self.amafWins = [0] * size
+        self.amafVisits = [0] * size
+
+    def RaveSelectChild(self, exploration=1.0, raveEquivalence=300):
+        """ Como UCTSelectChild, pero el ratio de victorias de cada hijo se mezcla con su valor AMAF:
+                (1 - beta) * wins/visits + beta * amafWins/amafVisits,   beta = sqrt(k / (3 * visits + k))
+            con k = raveEquivalence (numero de visitas con el que las dos estimaciones pesan lo mismo).
+            Con pocas visitas manda el AMAF, que tiene muchas mas muestras; con muchas visitas, el valor del propio hijo.
+            Los hijos con valor demostrado (MCTS-Solver) se saltan, como en UCTSelectUnprovenChild.
+        """
+        c2LogVisits = 2 * log(self.visits) if self.visits > 0 else 0.0
+        amafWins, amafVisits = self.amafWins, self.amafVisits
+        best, bestScore = None, -1.0
+        for c in self.childNodes:
+            if c.proven is not None:
+                continue
+            if c.visits == 0:
+                return c
+            value = c.wins / c.visits
+            n = amafVisits[c.move]
+            if n > 0:
+                beta = sqrt(raveEquivalence / (3 * c.visits + raveEquivalence))
+                value += beta * (amafWins[c.move] / n - value)
+            score = value + exploration * sqrt(c2LogVisits / c.visits)
+            if score > bestScore:
+                best, bestScore = c, score
+        return best
+
+
+def UpdateAmaf(leaf, state, results):
+    """ Actualiza las estadisticas AMAF de los RaveNode del camino desde la raiz hasta leaf con la iteracion terminada.
+        state.moveStack tiene todos los movimientos de la iteracion desde la raiz (arbol y simulacion); el movimiento k
+        lo hace el jugador (raiz.playerJustMoved + k) % numPlayers + 1. Se recorren los movimientos una sola vez,
+        del ultimo al primero, deshaciendo las alturas de las columnas y acumulando las casillas de cada jugador:
+        al llegar a la profundidad d, heights es la del estado del nodo d y cada columna m cuenta si su primera casilla
+        libre la ocupo despues el jugador que mueve en el nodo.
+
+        @input results: (list) resultado de cada jugador (ver GameState.GetResults).
+    """
+    path = []
+    node = leaf
+    while node is not None:
+        path.append(node)  # path[-1] es la raiz
+        node = node.parentNode
+    moves = state.moveStack
+    numPlayers = state.numPlayers
+    first = path[-1].playerJustMoved  # (first + k) % numPlayers es el indice del jugador del movimiento k
+    stride = state.height + 1
+    heights = state.heights[:]
+    seen = [set() for p in range(numPlayers)]  # casillas (x * stride + y) de cada jugador
+    k = len(moves) - 1
+    for depth in range(len(path) - 1, -1, -1):
+        while k >= depth:
+            m = moves[k]
+            heights[m] -= 1
+            seen[(first + k) % numPlayers].add(m * stride + heights[m])
+            k -= 1
+        node = path[len(path) - 1 - depth]
+        mover = (first + depth) % numPlayers
+        cells, result = seen[mover], results[mover]
+        amafWins, amafVisits = node.amafWins, node.amafVisits
+        for m in range(len(amafVisits)):
+            if m * stride + heights[m] in cells:
+                amafVisits[m] += 1
+                amafWins[m] += result
+
+
+class SharedNode(Node):
+    """ Nodo de un game tree compartido por varios threads (ver TreeParallelUCT).
+        Cada thread tiene sus propios contadores de victorias y visitas (workerWins[w], workerVisits[w]):
+        un thread solo escribe en su posicion y los demas solo leen, asi que no hace falta ningun lock.
+        Las estadisticas del nodo son la suma de los contadores de todos los threads.
+    """
+    __slots__ = ('workerWins', 'workerVisits')
+
+    def __init__(self, move=None, parent=None, state=None, workers=1):
+        Node.__init__(self, move=move, parent=parent, state=state)
+        random.shuffle(self.untriedMoves)  # la expansion hace pop() (atomico) en vez de random.choice + remove
+        self.workerWins = [0] * workers
+        self.workerVisits = [0] * workers
+
+    def UCTSelectChild(self, exploration=1.0):
+        """ Igual que Node.UCTSelectChild pero con las estadisticas sumadas de todos los threads.
+            Las visitas incluyen las virtual losses de los threads que todavia estan en una iteracion,
+            asi que los nodos por los que esta pasando otro thread parecen peores y cada thread explora una rama distinta.
+            Un nodo hijo sin ninguna visita (recien anhadido por otro thread) se selecciona primero.
+            Sin virtual loss, otro thread puede llegar a un nodo con hijos y todavia sin ninguna visita terminada.
+
+            @input exploration: (float) la constante de la formula de UCB1.
+        """
+        parentVisits = sum(self.workerVisits)
+        c2LogVisits = 2 * log(parentVisits) if parentVisits > 0 else 0.0
+        best, bestScore = None, None
+        for c in self.childNodes:
+            visits = sum(c.workerVisits)
+            if visits <= 0:
+                return c
+            score = sum(c.workerWins) / visits + exploration * sqrt(c2LogVisits / visits)
+            if best is None or score > bestScore:
+                best, bestScore = c, score
+        return best
+
+    def AddVirtualLoss(self, worker, virtualLoss):
+        """ Anhade virtualLoss visitas sin victorias, que se quitan en Update() al terminar la iteracion.
+        """
+        self.workerVisits[worker] += virtualLoss
+
+    def Update(self, result, worker=0, virtualLoss=0):
+        """ Actualiza los contadores del thread worker y deshace su virtual loss.
+
+            @input result: (int) 1 denota victoria, 0 para el resto de los casos.
+            @input worker: (int) indice del thread que actualiza el nodo.
+            @input virtualLoss: (int) virtual loss anhadida al bajar por este nodo.
+        """
+        self.workerVisits[worker] += 1 - virtualLoss
+        self.workerWins[worker] += result
+
+    def Consolidate(self):
+        """ Copia la suma de los contadores de los threads a wins/visits, para poder usar
+            las funciones de Node (seleccion de accion, ChildrenToString...) al terminar la busqueda.
+        """
+        self.wins = sum(self.workerWins)
+        self.visits = sum(self.workerVisits)
+        for c in self.childNodes:
+            c.wins = sum(c.workerWins)
+            c.visits = sum(c.workerVisits)
+
+
+class ArrayTree:
+    """ Game tree guardado como struct-of-arrays: cada estadistica de los nodos esta en un array
+        (modulo array de la libreria estandar) y un nodo es un indice en esos arrays. El nodo 0 es la raiz.
+        Los hijos de un nodo forman una lista enlazada: firstChild[padre] y nextSibling[hijo]; -1 = ninguno.
+        Los movimientos no probados se guardan como una mascara de bits (untried), por lo que los
+        movimientos tienen que ser enteros entre 0 y 62 (como las columnas del 4 en raya).
+        Los arrays crecen de chunk en chunk nodos, sin crear ningun objeto Python por nodo.
+    """
+
+    def __init__(self, chunk=4096):
+        self.chunk = chunk
+        self.size = 0  # numero de nodos usados
+        self.capacity = 0  # numero de nodos reservados en los arrays
+        self.move = array.array('i')  # -1 para el nodo raiz
+        self.parent = array.array('i')
+        self.firstChild = array.array('i')
+        self.nextSibling = array.array('i')
+        self.playerJustMoved = array.array('b')
+        self.untried = array.array('q')  # bit m a 1 = el movimiento m todavia no se ha expandido ('q': 64 bits tambien en Windows)
+        self.wins = array.array('d')
+        self.visits = array.array('q')
+
+    def Grow(self):
+        """ Reserva chunk nodos mas en todos los arrays.
+        """
+        for arr in (self.move, self.parent, self.firstChild, self.nextSibling,
+                    self.playerJustMoved, self.untried, self.wins, self.visits):
+            arr.extend(array.array(arr.typecode, [0]) * self.chunk)
+        self.capacity += self.chunk
+
+    def AddNode(self, move, parent, state):
+        """ Anhade un nodo para state, hijo de parent (-1 para la raiz), y lo quita de los movimientos no probados del padre.
+
+            @output index: (int) indice del nuevo nodo.
+        """
+        if self.size == self.capacity:
+            self.Grow()
+        index = self.size
+        self.size += 1
+        self.move[index] = move
+        self.parent[index] = parent
+        self.firstChild[index] = -1
+        self.playerJustMoved[index] = state.playerJustMoved
+        untried = 0
+        for m in state.GetMoves():
+            untried |= 1 << m
+        self.untried[index] = untried
+        self.wins[index] = 0
+        self.visits[index] = 0
+        if parent >= 0:
+            self.nextSibling[index] = self.firstChild[parent]
+            self.firstChild[parent] = index
+            self.untried[parent] &= ~(1 << move)
+        else:
+            self.nextSibling[index] = -1
+        return index
+
+    def UntriedMoves(self, index):
+        mask = self.untried[index]
+        return [m for m in range(mask.bit_length()) if mask >> m & 1]
+
+    def Children(self, index):
+        c = self.firstChild[index]
+        while c != -1:
+            yield c
+            c = self.nextSibling[c]
+
+    def UCTSelectChild(self, index, exploration=1.0):
+        """ Misma formula UCB1 que Node.UCTSelectChild, para el nodo index.
+        """
+        c2LogVisits = 2 * log(self.visits[index])
+        wins, visits = self.wins, self.visits
+        best, bestScore = -1, -1.0
+        c = self.firstChild[index]
+        while c != -1:
+            if visits[c] == 0:
+                return c
+            score = wins[c] / visits[c] + exploration * sqrt(c2LogVisits / visits[c])
+            if score > bestScore:
+                best, bestScore = c, score
+            c = self.nextSibling[c]
+        return best
+
+    def Update(self, index, result):
+        self.visits[index] += 1
+        self.wins[index] += result
+
+    def SelectMove(self, index=0):
+        """ Movimiento del nodo hijo de index con mayor ratio de victorias (como SelectMove).
+        """
+        return self.move[max(self.Children(index), key=lambda c: self.wins[c] / self.visits[c])]
+
+    """ Funciones para debuggear y modo verbose
+    """
+    def NodeToString(self, index):
+        move = self.move[index] if self.parent[index] != -1 else None
+        return "[M:" + str(move) + " W/V:" + ("%g" % self.wins[index]) + "/" + str(self.visits[index]) + " U:" + str(
+            self.UntriedMoves(index)) + "]"
+
+    def TreeToString(self, index=0, indent=0):
+        """ Mismo formato que Node.TreeToString, pero iterativo (sin limite de recursion) y sin concatenar strings.
+        """
+        lines = [""]
+        stack = [(index, indent)]
+        while stack:
+            node, depth = stack.pop()
+            lines.append("| " * depth + self.NodeToString(node))
+            stack.extend(reversed([(c, depth + 1) for c in self.Children(node)]))
+        return "\n".join(lines)
+
+    def ChildrenToString(self, index=0):
+        return "".join(self.NodeToString(c) + "\n" for c in self.Children(index))
+
+
+class TranspositionNode:
+    """ Nodo de un game tree con transposiciones (en realidad un DAG): hay un unico nodo por posicion,
+        aunque se llegue a ella por distintos ordenes de movimientos. Los nodos estan en una
+        TranspositionTable indexada por el hash de Zobrist del estado. Un nodo no guarda referencias
+        a sus hijos ni a su padre (puede tener varios), solo el hash de cada hijo: childHashes[move].
+    """
+
+    def __init__(self, state):
+        self.wins = 0
+        self.visits = 0
+        self.untriedMoves = state.GetMoves()  # Futuros nodos hijo
+        self.childHashes = {}  # move -> hash del estado hijo
+        self.playerJustMoved = state.playerJustMoved
+
+    def UCTSelectChild(self, table, exploration=1.0):
+        """ Igual que Node.UCTSelectChild, pero los nodos hijo se buscan en table.
+            Si un nodo hijo ha sido expulsado de la tabla, su movimiento vuelve a untriedMoves
+            y se devuelve (None, None) para que la iteracion lo expanda de nuevo.
+
+            @input exploration: (float) la constante de la formula de UCB1.
+
+            @output: (tuple) (move, node) del nodo hijo seleccionado.
+        """
+        logVisits = log(self.visits)
+        bestMove, best, bestScore = None, None, None
+        for (move, h) in list(self.childHashes.items()):
+            c = table.Get(h)
+            if c is None:
+                del self.childHashes[move]
+                self.untriedMoves.append(move)
+                return None, None
+            score = c.wins / c.visits + exploration * sqrt(2 * logVisits / c.visits)
+            if best is None or score > bestScore:
+                bestMove, best, bestScore = move, c, score
+        return bestMove, best
+
+    def Update(self, result):
+        self.visits += 1
+        self.wins += result
+
+
+class TranspositionTable:
+    """ Tabla hash -> TranspositionNode con un tamanho maximo. Cuando esta llena se expulsa
+        el nodo usado hace mas tiempo (LRU). Cuenta cuantas veces se ha reutilizado un nodo
+        (transposiciones) y cuantos nodos se han expulsado.
+    """
+
+    def __init__(self, maxNodes=1000000):
+        self.maxNodes = maxNodes
+        self.nodes = collections.OrderedDict()  # de menos a mas recientemente usado
+        self.hits = 0
+        self.evictions = 0
+
+    def Get(self, h):
+        """ Devuelve el nodo con hash h (o None) y lo marca como el usado mas recientemente.
+        """
+        node = self.nodes.pop(h, None)
+        if node is not None:
+            self.nodes[h] = node
+        return node
+
+    def Put(self, h, node):
+        if len(self.nodes) >= self.maxNodes:
+            self.nodes.popitem(last=False)
+            self.evictions += 1
+        self.nodes[h] = node
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+def CountNodes(rootnode):
+    """ Numero de nodos de un game tree (sin recursion, para arboles profundos).
+    """
+    count, stack = 0, [rootnode]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.childNodes)
+    return count
@@ -0,0 +1,287 @@
+# Arena: partidas automaticas entre dos configuraciones de MCTS-UCT (paquete mcts), sin jugador humano.
+# Sirve para comprobar que un cambio de velocidad no ha cambiado la fuerza de juego.
+# Uso:
+#   python -m mcts_arena --agent1 itermax=1000,policy=threat --agent2 itermax=1000 --games 100
+#   python -m mcts_arena --agent1 timeBudgetMs=50 --agent2 timeBudgetMs=50,undoMoves=1 --output arena.jsonl
+# Cada partida se escribe como una linea JSON (JSONL) y al final una linea con el resumen ("type": "summary").
+# El resumen legible (victorias/empates/derrotas, Elo, latencia, iteraciones/s) se imprime por stderr.
+
+import random
+import sys
+import time
+from math import log10, sqrt
+
+import mcts
+
+
+# Opciones de un agente y su tipo. Un agente se escribe como "opcion=valor,opcion=valor" (ver ParseAgent).
+AGENT_OPTIONS = {
+    'name': str,
+    'itermax': int,  # iteraciones por movimiento
+    'timeBudgetMs': int,  # tiempo maximo por movimiento
+    'exploration': float,  # constante de UCB1
+    'policy': str,  # politica de simulacion: random o threat (Connect4ThreatPolicy)
+    'undoMoves': bool,  # UCTSearch con DoMove/UndoMove
+    'symmetry': bool,  # UCTSearch con symmetry
+    'compactTree': bool,  # ArrayUCTSearch
+    'batchSize': int,  # BatchUCTSearch (necesita NumPy)
+    'transpositions': bool,  # TranspositionUCT
+    'book': str,  # fichero de OpeningBook
+    'maxNodes': int,  # UCTSearch con NodeLimit
+    'pruneTree': bool,  # con maxNodes: poda en vez de dejar de expandir
+    'solver': int,  # UCTSearch con EndgameSolver(maxEmpty=solver)
+    'rave': bool,  # UCTSearch con RAVE / AMAF
+    'raveEquivalence': float,  # constante k de la mezcla de RAVE
+    'widening': float,  # UCTSearch con ProgressiveWidening(widenExponent=widening)
+    'prior': str,  # prior de ProgressiveWidening: centre o threat
+    'expandVisits': int,  # visitas de una hoja antes de crear su primer hijo (con widening)
+}
+
+
+def ParseBool(text):
+    return text.lower() in ('1', 'true', 'yes', 'si')
+
+
+def ParseAgent(text):
+    """ Convierte "itermax=1000,policy=threat" en un diccionario de configuracion de agente.
+        Si no se da itermax ni timeBudgetMs, itermax = 1000.
+    """
+    config = {}
+    for item in text.split(','):
+        if not item:
+            continue
+        key, value = item.split('=', 1)
+        if key not in AGENT_OPTIONS:
+            raise ValueError("opcion de agente desconocida: " + key)
+        config[key] = ParseBool(value) if AGENT_OPTIONS[key] is bool else AGENT_OPTIONS[key](value)
+    if 'itermax' not in config and 'timeBudgetMs' not in config:
+        config['itermax'] = 1000
+    for key in ('transpositions', 'batchSize'):
+        if config.get(key) and 'itermax' not in config:
+            raise ValueError(key + " no admite timeBudgetMs: hace falta itermax")
+    config.setdefault('name', text)
+    return config
+
+
+def AgentArgument(text):
+    """ ParseAgent para argparse: sus errores se muestran con el mensaje de ParseAgent.
+    """
+    import argparse
+    try:
+        return ParseAgent(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+class Agent:
+    """ Jugador headless configurado con un diccionario de ParseAgent. Search(state) devuelve (move, iterations)
+        llamando directamente a la funcion de busqueda de cada modo, sin los print de UCT().
+    """
+
+    def __init__(self, engine, config, width=7, height=6, connect=4):
+        self.engine = engine
+        self.config = config
+        self.itermax = config.get('itermax')
+        self.timeBudgetMs = config.get('timeBudgetMs')
+        self.exploration = config.get('exploration', 1.0)
+        self.rolloutPolicy = None
+        if config.get('policy', 'random') == 'threat':
+            self.rolloutPolicy = engine.Connect4ThreatPolicy(width, height, connect)
+        self.book = engine.OpeningBook(config['book']) if config.get('book') else None
+        self.solver = engine.EndgameSolver(config['solver']) if config.get('solver') else None
+        self.expansion = None
+        if config.get('widening'):
+            prior = engine.ThreatPrior(width, height, connect) if config.get('prior') == 'threat' else engine.CentrePrior()
+            self.expansion = engine.ProgressiveWidening(prior, widenExponent=config['widening'],
+                                                        expandVisits=config.get('expandVisits', 0))
+
+    def Search(self, state):
+        engine, config = self.engine, self.config
+        if self.book is not None:
+            move = self.book.BestMove(state, minVisits=self.itermax or 0)
+            if move is not None:
+                return move, 0
+        if config.get('transpositions'):
+            return engine.TranspositionUCT(state, self.itermax, symmetry=config.get('symmetry', False),
+                                           exploration=self.exploration)
+        if config.get('compactTree'):
+            tree = engine.ArrayUCTSearch(state, self.itermax, timeBudgetMs=self.timeBudgetMs, exploration=self.exploration)
+            return tree.SelectMove(), tree.visits[0]
+        if config.get('batchSize'):
+            rootnode = engine.BatchUCTSearch(state, self.itermax, batchSize=config['batchSize'], exploration=self.exploration)
+        else:
+            nodeLimit = None
+            if config.get('maxNodes'):
+                nodeLimit = engine.NodeLimit(config['maxNodes'], prune=config.get('pruneTree', False))
+            rootnode = engine.UCTSearch(state, self.itermax, timeBudgetMs=self.timeBudgetMs, exploration=self.exploration,
+                                        undoMoves=config.get('undoMoves', False), rolloutPolicy=self.rolloutPolicy,
+                                        symmetry=config.get('symmetry', False), nodeLimit=nodeLimit, solver=self.solver,
+                                        rave=config.get('rave', False), raveEquivalence=config.get('raveEquivalence', 300),
+                                        expansion=self.expansion)
+        return engine.SelectMove(rootnode), rootnode.visits
+
+
+def PlayArenaGame(job):
+    """ Juega una partida (en un proceso del pool). Los colores se alternan: en las partidas pares empieza agent1.
+        La semilla de la partida es seed + game, asi que cada partida es reproducible por separado
+        (salvo los agentes con timeBudgetMs, que dependen de la velocidad de la maquina).
+
+        @input job: (tuple) (config1, config2, game, seed, width, height, connect)
+
+        @output: (dict) una linea del JSONL
+    """
+    config1, config2, game, seed, width, height, connect = job
+    engine = mcts  # los submodulos se cargan segun lo que usen los agentes
+    random.seed(seed + game)
+    agents = [Agent(engine, config, width, height, connect) for config in (config1, config2)]
+    first = 0 if game % 2 == 0 else 1  # indice del agente que juega con el jugador 1
+    stats = [{"moves": 0, "seconds": 0.0, "iterations": 0} for a in agents]
+
+    state = engine.BitboardConnect4State(width=width, height=height, connect=connect)
+    moves = []
+    while not state.IsGameOver():
+        player = 3 - state.playerJustMoved
+        a = first if player == 1 else 1 - first
+        start = time.time()
+        move, iterations = agents[a].Search(state)
+        stats[a]["seconds"] += time.time() - start
+        stats[a]["moves"] += 1
+        stats[a]["iterations"] += iterations
+        state.DoMove(move)
+        moves.append(move)
+
+    if state.winner == 0:
+        result = "draw"
+    else:
+        result = "agent1" if (state.winner == 1) == (first == 0) else "agent2"
+    return {"type": "game", "game": game, "seed": seed + game, "agent1Player": 1 if first == 0 else 2,
+            "result": result, "moves": moves, "agent1": stats[0], "agent2": stats[1]}
+
+
+def Elo(score):
+    """ Diferencia de Elo que corresponde a una puntuacion media score (victoria = 1, empate = 0.5).
+        None si score es 0 o 1 (diferencia infinita).
+    """
+    if score <= 0 or score >= 1:
+        return None
+    return 400 * log10(score / (1 - score))
+
+
+def WilsonInterval(score, n, z=1.96):
+    """ Intervalo de confianza de Wilson de una puntuacion media score en n partidas (z = 1.96: 95%).
+        A diferencia de score +- z * error estandar, nunca se sale de [0, 1] y no tiene anchura 0 con 0 o n victorias:
+        solo el extremo del lado de score llega a 0 (o a 1), el otro queda dentro de (0, 1).
+        Los empates cuentan como media victoria; con empates el intervalo es algo mas ancho de la cuenta.
+
+        @output: (tuple) (low, high) puntuaciones medias de los extremos del intervalo.
+    """
+    z2 = z * z
+    centre = (score + z2 / (2 * n)) / (1 + z2 / n)
+    margin = z / (1 + z2 / n) * sqrt(score * (1 - score) / n + z2 / (4 * n * n))
+    low = 0.0 if score == 0 else centre - margin  # en los extremos centre == margin salvo por el redondeo
+    high = 1.0 if score == 1 else centre + margin
+    return low, high
+
+
+def Summarize(games, config1, config2):
+    """ Resumen de las partidas desde el punto de vista de agent1: victorias, empates, derrotas,
+        diferencia de Elo con intervalo de confianza del 95% (intervalo de Wilson de la puntuacion media, ver WilsonInterval),
+        latencia media por movimiento e iteraciones por segundo de cada agente.
+    """
+    n = len(games)
+    wins = sum(1 for g in games if g["result"] == "agent1")
+    draws = sum(1 for g in games if g["result"] == "draw")
+    losses = n - wins - draws
+    summary = {"type": "summary", "games": n, "wins": wins, "draws": draws, "losses": losses, "score": None,
+               "scoreLow": None, "scoreHigh": None, "elo": None, "eloLow": None, "eloHigh": None}
+    if n > 0:  # sin partidas no hay puntuacion ni Elo
+        score = (wins + draws / 2) / n
+        low, high = WilsonInterval(score, n)
+        summary.update({"score": score, "scoreLow": low, "scoreHigh": high, "elo": Elo(score), "eloLow": Elo(low),
+                        "eloHigh": Elo(high)})
+    for (key, config) in [("agent1", config1), ("agent2", config2)]:
+        moves = sum(g[key]["moves"] for g in games)
+        seconds = sum(g[key]["seconds"] for g in games)
+        iterations = sum(g[key]["iterations"] for g in games)
+        summary[key] = {"config": config, "moves": moves, "latencyMs": 1000 * seconds / max(1, moves),
+                        "iterationsPerSecond": iterations / seconds if seconds > 0 else 0.0}
+    return summary
+
+
+def FormatElo(elo, score):
+    """ Elo con signo. Si es infinito (None), el signo sale de score.
+    """
+    if elo is None:
+        return "+inf" if score >= 0.5 else "-inf"
+    return "%+.0f" % elo
+
+
+def RunArena(config1, config2, games, workers=None, seed=0, width=7, height=6, connect=4, output=None):
+    """ Juega games partidas entre config1 y config2 en un pool de workers procesos.
+        Cada partida se escribe en output (JSONL) en cuanto termina, en orden, y al final el resumen.
+
+        @output summary: (dict) ver Summarize
+    """
+    import json  # solo aqui: importar mcts_arena (p.ej. para usar Agent) no paga por json ni multiprocessing
+    import multiprocessing
+    jobs = [(config1, config2, g, seed, width, height, connect) for g in range(games)]
+    results = []
+    pool = multiprocessing.Pool(workers)
+    try:
+        for result in pool.imap(PlayArenaGame, jobs):
+            results.append(result)
+            if output is not None:
+                output.write(json.dumps(result, sort_keys=True) + "\n")
+                output.flush()
+    finally:
+        pool.close()
+        pool.join()
+    summary = Summarize(results, config1, config2)
+    if output is not None:
+        output.write(json.dumps(summary, sort_keys=True) + "\n")
+    return summary
+
+
+def PrintSummary(summary, stream=sys.stderr):
+    stream.write("%s contra %s: %d partidas\n" % (summary["agent1"]["config"]["name"],
+                                                   summary["agent2"]["config"]["name"], summary["games"]))
+    if summary["games"] == 0:
+        return
+    stream.write("victorias %d  empates %d  derrotas %d  puntuacion %.3f\n"
+                 % (summary["wins"], summary["draws"], summary["losses"], summary["score"]))
+    stream.write("Elo %s  (95%%: %s .. %s)\n" % (FormatElo(summary["elo"], summary["score"]),
+                                                  FormatElo(summary["eloLow"], summary["scoreLow"]),
+                                                  FormatElo(summary["eloHigh"], summary["scoreHigh"])))
+    for key in ["agent1", "agent2"]:
+        stream.write("%s: %.1f ms por movimiento, %.0f iteraciones/s\n"
+                     % (key, summary[key]["latencyMs"], summary[key]["iterationsPerSecond"]))
+
+
+def Main(argv=None):
+    import argparse  # como multiprocessing, solo lo necesita la linea de comandos
+    parser = argparse.ArgumentParser(prog="mcts_arena", description="Partidas automaticas entre dos agentes MCTS-UCT.")
+    parser.add_argument("--agent1", type=AgentArgument, default="itermax=1000",
+                        help="opciones del agente, p.ej. itermax=1000,policy=threat (%s)" % ", ".join(sorted(AGENT_OPTIONS)))
+    parser.add_argument("--agent2", type=AgentArgument, default="itermax=1000")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=7)
+    parser.add_argument("--height", type=int, default=6)
+    parser.add_argument("--connect", type=int, default=4, help="fichas en linea para ganar")
+    parser.add_argument("--output", help="fichero JSONL de salida (por defecto stdout)")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        summary = RunArena(args.agent1, args.agent2, args.games, workers=args.workers, seed=args.seed,
+                           width=args.width, height=args.height, connect=args.connect, output=output)
+    finally:
+        if args.output:
+            output.close()
+    PrintSummary(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
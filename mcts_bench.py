@@ -0,0 +1,224 @@
+# Benchmarks del camino critico de MCTS-UCT (paquete mcts).
+# Uso:
+#   python -m mcts_bench                          micro-benchmarks, resultados en JSON por stdout
+#   python -m mcts_bench --output actual.json     guarda los resultados en un fichero
+#   python -m mcts_bench --compare base.json      compara con una ejecucion anterior y avisa de regresiones
+#   python -m mcts_bench --profile                tiempo de cada fase de UCT (seleccion, expansion, simulacion, retropropagacion)
+#   python -m mcts_bench parallel                 ejecuta uno de los benchmarks de mcts.benchmarks (ver SUITES)
+
+import argparse
+import cProfile
+import json
+import platform
+import pstats
+import random
+import sys
+import time
+import timeit
+
+from mcts.benchmarks import SUITES  # benchmarks de funcionalidades concretas
+
+
+def LoadEngine():
+    """ El paquete mcts. Sus nombres se importan la primera vez que se usan (engine.UCTSearch, engine.Node...).
+    """
+    import mcts
+    return mcts
+
+
+# Posiciones fijas (lista de movimientos desde el tablero vacio), para que los resultados sean comparables entre versiones.
+POSITIONS = [
+    ("vacio", []),
+    ("apertura", [3, 5, 0, 6]),
+    ("medio", [0, 6, 3, 2, 4, 5, 1, 4, 4, 1, 2, 5]),
+    ("final", [6, 0, 1, 0, 6, 3, 1, 5, 6, 6, 4, 5, 1, 2, 4, 3, 4, 1, 0, 1, 2, 6, 6, 0]),
+]
+
+
+
+def MakePosition(stateClass, moves):
+    state = stateClass(width=7, height=6)
+    for m in moves:
+        state.DoMove(m)
+    return state
+
+
+def TimeOperation(operation, number, repeat):
+    """ Ejecuta operation() number veces, repeat veces, y devuelve el mejor tiempo por llamada en segundos.
+    """
+    timer = timeit.Timer(operation)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def RandomRollout(state):
+    while not state.IsGameOver():
+        state.DoMove(state.RandomMove())
+
+
+def MicroBenchmarks(engine, scale=1.0, repeat=5, itermax=2000, seed=0):
+    """ Mide las operaciones del camino critico en cada posicion de POSITIONS, con Connect4State y BitboardConnect4State.
+
+        @input scale: (float) multiplica el numero de llamadas de cada medida (0.1 para una ejecucion rapida).
+
+        @output results: (list) un diccionario por medida: name, state, position, seconds (por llamada), per_second.
+    """
+    results = []
+
+    def Record(name, stateName, positionName, seconds):
+        results.append({"name": name, "state": stateName, "position": positionName,
+                        "seconds": seconds, "per_second": 1 / seconds})
+
+    n = max(1, int(10000 * scale))
+    for stateClass in [engine.Connect4State, engine.BitboardConnect4State]:
+        stateName = stateClass.__name__
+        for (positionName, moves) in POSITIONS:
+            state = MakePosition(stateClass, moves)
+            legal = state.GetMoves()
+
+            Record("Clone", stateName, positionName, TimeOperation(state.Clone, n, repeat))
+            Record("GetMoves", stateName, positionName, TimeOperation(state.GetMoves, n, repeat))
+
+            clones = [state.Clone() for i in range(n)]
+            move = legal[len(legal) // 2]
+            start = time.time()
+            for st in clones:
+                st.DoMove(move)
+            Record("DoMove", stateName, positionName, (time.time() - start) / n)
+
+            if moves:
+                x = moves[-1]
+                y = sum(1 for m in moves if m == x) - 1
+                Record("DoesMoveWin", stateName, positionName,
+                       TimeOperation(lambda: state.DoesMoveWin(x, y), n, repeat))
+
+            rollouts = max(1, n // 20)
+            random.seed(seed)
+            clones = [state.Clone() for i in range(rollouts)]
+            start = time.time()
+            for st in clones:
+                RandomRollout(st)
+            Record("RandomRollout", stateName, positionName, (time.time() - start) / rollouts)
+
+            iterations = max(1, int(itermax * scale))
+            random.seed(seed)
+            start = time.time()
+            rootnode = engine.UCTSearch(state, iterations)
+            Record("UCTIteration", stateName, positionName, (time.time() - start) / iterations)
+
+            Record("UCTSelectChild", stateName, positionName, TimeOperation(rootnode.UCTSelectChild, n, repeat))
+
+    return results
+
+
+def ProfiledSearch(engine, rootstate, itermax):
+    """ Copia de UCTSearch con cada fase en su propia funcion, para que cProfile mida cada fase por separado.
+    """
+
+    def Selection(node, state):
+        while node.untriedMoves == [] and node.childNodes != []:
+            node = node.UCTSelectChild()
+            state.DoMove(node.move)
+        return node
+
+    def Expansion(node, state):
+        if node.untriedMoves != []:
+            m = random.choice(node.untriedMoves)
+            state.DoMove(m)
+            node = node.AddChild(m, state)
+        return node
+
+    def Simulation(state):
+        while not state.IsGameOver():
+            state.DoMove(state.RandomMove())
+
+    def Backpropagation(node, state):
+        while node is not None:
+            node.Update(state.GetResult(node.playerJustMoved))
+            node = node.parentNode
+
+    rootnode = engine.Node(state=rootstate)
+    for i in range(itermax):
+        state = rootstate.Clone()
+        node = Selection(rootnode, state)
+        node = Expansion(node, state)
+        Simulation(state)
+        Backpropagation(node, state)
+    return rootnode
+
+
+def ProfilePhases(engine, itermax=5000, seed=0):
+    """ Ejecuta ProfiledSearch con cProfile en cada posicion y devuelve el tiempo acumulado de cada fase.
+    """
+    phases = ["Selection", "Expansion", "Simulation", "Backpropagation"]
+    results = []
+    for (positionName, moves) in POSITIONS:
+        rootstate = MakePosition(engine.Connect4State, moves)
+        random.seed(seed)
+        profiler = cProfile.Profile()
+        profiler.runcall(ProfiledSearch, engine, rootstate, itermax)
+        stats = pstats.Stats(profiler).stats
+        total = sum(tt for (cc, nc, tt, ct, callers) in stats.values())
+        row = {"position": positionName, "itermax": itermax, "total_seconds": total}
+        for (filename, line, function), (cc, nc, tt, ct, callers) in stats.items():
+            if function in phases:
+                row[function] = ct
+        results.append(row)
+    return results
+
+
+def Compare(results, baselinePath, tolerance):
+    """ Compara con un JSON anterior. Devuelve la lista de medidas que son mas lentas que tolerance (0.1 = 10%).
+    """
+    with open(baselinePath) as f:
+        baseline = json.load(f)
+    previous = dict(((r["name"], r["state"], r["position"]), r["seconds"]) for r in baseline["results"])
+    regressions = []
+    for r in results:
+        key = (r["name"], r["state"], r["position"])
+        if key in previous and r["seconds"] > previous[key] * (1 + tolerance):
+            regressions.append((key, previous[key], r["seconds"]))
+    return regressions
+
+
+def Main(argv=None):
+    parser = argparse.ArgumentParser(prog="mcts_bench", description="Benchmarks del camino critico de MCTS-UCT.")
+    parser.add_argument("suite", nargs="?", default="micro", choices=["micro"] + sorted(SUITES.keys()))
+    parser.add_argument("--output", help="fichero JSON de salida (por defecto stdout)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplica el numero de repeticiones")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", action="store_true", help="anhade el tiempo de cada fase de UCT (cProfile)")
+    parser.add_argument("--compare", help="JSON de una ejecucion anterior")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="ralentizacion permitida con --compare")
+    args = parser.parse_args(argv)
+
+    engine = LoadEngine()
+    if args.suite != "micro":
+        getattr(engine, SUITES[args.suite])()
+        return 0
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": MicroBenchmarks(engine, scale=args.scale, seed=args.seed),
+    }
+    if args.profile:
+        report["phases"] = ProfilePhases(engine, itermax=max(1, int(5000 * args.scale)), seed=args.seed)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        regressions = Compare(report["results"], args.compare, args.tolerance)
+        for (key, before, after) in regressions:
+            sys.stderr.write("REGRESION %s/%s/%s: %.3gs -> %.3gs\n" % (key + (before, after)))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
@@ -0,0 +1,277 @@
+# Evaluacion de hojas en lote para MCTS-UCT (paquete mcts) con un modelo (red de valor/politica, modelo lineal...).
+# En vez de una simulacion al azar por hoja, varias corrutinas de asyncio bajan por el mismo game tree con virtual loss,
+# cada una deja su hoja en una EvaluationQueue y la cola manda todas las hojas pendientes juntas a evaluator.Evaluate(states).
+# Necesita NumPy (LinearEvaluator).
+# Uso:
+#   python -m mcts_evaluator                          iteraciones/s segun el tamanho del lote con LinearEvaluator
+#   python -m mcts_evaluator --batch-sizes 1,16,64 --itermax 4000 --games 4
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from mcts import BitboardConnect4State, Node, SelectMove
+
+
+def BoardPlanes(states):
+    """ Tableros de states en un array (N, width, height): 0 = vacio, p = ficha del jugador p.
+        Con Connect4State se copia board; con BitboardConnect4State se desempaquetan los bits con NumPy.
+    """
+    first = states[0]
+    if hasattr(first, 'board'):
+        return np.array([state.board for state in states], dtype=np.int8)
+    width, height = first.width, first.height
+    bits = np.array([[x * (height + 1) + y for y in range(height)] for x in range(width)], dtype=np.uint64)
+    planes = np.zeros((len(states), width, height), dtype=np.int8)
+    for p in range(first.numPlayers):
+        boards = np.array([state.bitboards[p] for state in states], dtype=np.uint64)
+        planes[((boards[:, None, None] >> bits) & np.uint64(1)).astype(bool)] = p + 1
+    return planes
+
+
+def CellWeights(width, height, connect=4):
+    """ Numero de lineas de connect casillas que pasan por cada casilla (la tabla clasica 3 4 5 7 5 4 3 ... del 4 en raya).
+    """
+    weights = np.zeros((width, height))
+    for (dx, dy) in [(1, 0), (0, 1), (1, 1), (1, -1)]:
+        for x in range(width):
+            for y in range(height):
+                cells = [(x + k * dx, y + k * dy) for k in range(connect)]
+                if all(0 <= cx < width and 0 <= cy < height for (cx, cy) in cells):
+                    for (cx, cy) in cells:
+                        weights[cx, cy] += 1
+    return weights
+
+
+class LinearEvaluator:
+    """ Evaluador local (solo CPU) para probar y medir la API: un modelo lineal sobre las casillas del tablero.
+        Un evaluador es cualquier objeto con un metodo Evaluate como el de esta clase (no hace falta heredar de ella).
+        Las caracteristicas son dos planos width x height, las fichas de playerJustMoved y las del rival (+1 / -1):
+          - valor = sigmoide(features . valueWeights)
+          - politica = softmax(features . policyWeights + sesgo) sobre las columnas libres
+        Por defecto valueWeights sale de CellWeights (las casillas centrales valen mas) y policyWeights es aleatorio
+        (seed). Todo el lote se evalua con un producto de matrices.
+    """
+
+    def __init__(self, width=7, height=6, connect=4, valueScale=0.1, seed=0):
+        assert np is not None, "LinearEvaluator necesita NumPy"
+        rng = np.random.RandomState(seed)
+        self.width, self.height = width, height
+        self.valueWeights = valueScale * CellWeights(width, height, connect).ravel()
+        self.policyWeights = 0.01 * rng.standard_normal((width * height, width))
+        self.policyBias = -0.1 * np.abs(np.arange(width) - (width - 1) / 2)  # columnas centrales primero
+        self.calls = 0  # llamadas a Evaluate
+        self.positions = 0  # posiciones evaluadas
+        self.seconds = 0.0
+
+    def Evaluate(self, states):
+        """ Evalua un lote de hojas. Los estados no se pueden modificar: pertenecen a la busqueda.
+            En otros evaluadores Evaluate tambien puede ser una corrutina (async def), p.ej. para mandar el lote
+            a otro proceso o a una GPU.
+
+            @input states: (list) GameState de las hojas.
+
+            @output values: values[i] es la probabilidad de que gane states[i].playerJustMoved, en [0, 1]
+                            (el mismo punto de vista que Node.wins).
+            @output priors: priors[i][m] es la probabilidad a priori del movimiento m en states[i],
+                            o None si el modelo no tiene politica.
+        """
+        start = time.time()
+        planes = BoardPlanes(states).reshape(len(states), -1)
+        justMoved = np.array([state.playerJustMoved for state in states], dtype=np.int8)[:, None]
+        features = (planes == justMoved).astype(np.float64) - ((planes != justMoved) & (planes != 0))
+
+        values = 1 / (1 + np.exp(-features.dot(self.valueWeights)))
+        logits = features.dot(self.policyWeights) + self.policyBias
+        legal = np.zeros((len(states), self.width), dtype=bool)
+        for i, state in enumerate(states):
+            legal[i, state.GetMoves()] = True
+        logits = np.where(legal, logits, -np.inf)
+        priors = np.exp(logits - logits.max(axis=1, keepdims=True))
+        priors /= np.maximum(priors.sum(axis=1, keepdims=True), 1e-12)
+
+        self.calls += 1
+        self.positions += len(states)
+        self.seconds += time.time() - start
+        return values, priors
+
+
+class EvaluationQueue:
+    """ Junta las hojas de las corrutinas de busqueda en lotes para evaluator.Evaluate.
+        Una corrutina hace await queue.Evaluate(state) y espera a que se evalue su lote. El lote se manda cuando
+        tiene batchSize hojas o cuando las demas corrutinas dejan de anhadir hojas (todas estan esperando, ver FlushWhenIdle).
+        Se puede compartir entre varias busquedas a la vez (p.ej. varias partidas con el mismo modelo) para llenar los lotes.
+    """
+
+    def __init__(self, evaluator, batchSize=32):
+        self.evaluator = evaluator
+        self.batchSize = batchSize
+        self.pending = []  # (state, future) esperando a ser evaluados
+        self.flusher = None  # tarea de FlushWhenIdle, si hay hojas esperando
+        self.batches = 0
+        self.positions = 0
+        self.requests = 0  # llamadas a Evaluate
+
+    async def Evaluate(self, state):
+        """ @output (value, priors) de state (ver LinearEvaluator.Evaluate).
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((state, future))
+        self.requests += 1
+        if len(self.pending) >= self.batchSize:
+            await self.Flush()
+        elif self.flusher is None:
+            self.flusher = asyncio.ensure_future(self.FlushWhenIdle())
+        return await future
+
+    async def FlushWhenIdle(self):
+        """ Cede el turno a las demas corrutinas hasta que ninguna anhade hojas nuevas (todas esperan una evaluacion
+            o han terminado) y entonces manda el lote aunque no este lleno.
+        """
+        try:
+            requests = -1
+            while self.pending and self.requests != requests:
+                requests = self.requests
+                await asyncio.sleep(0)
+            if self.pending:
+                await self.Flush()
+        finally:
+            self.flusher = None
+
+    async def Flush(self):
+        batch, self.pending = self.pending, []
+        result = self.evaluator.Evaluate([state for (state, future) in batch])
+        if asyncio.iscoroutine(result):
+            result = await result
+        values, priors = result
+        self.batches += 1
+        self.positions += len(batch)
+        for i, (state, future) in enumerate(batch):
+            future.set_result((float(values[i]), None if priors is None else priors[i]))
+
+
+async def SearchWorker(rootnode, rootstate, iterations, queue, virtualLoss, exploration):
+    """ Bucle de una corrutina de AsyncUCTSearch. Mismas fases que UCTSearch, pero la simulacion es una llamada
+        a queue.Evaluate y cada nodo del camino tiene virtualLoss visitas sin victorias hasta la retropropagacion,
+        para que las demas corrutinas bajen por otras ramas mientras esta espera su resultado.
+        Los nodos terminales no se evaluan: se usa el resultado de la partida (GetResults, un empate vale 0 para los dos).
+        untriedMoves de cada nodo nuevo se baraja, y al llegar su evaluacion se ordena por la politica del modelo:
+        la expansion siempre coge el ultimo movimiento (al azar hasta que se conoce la politica, despues el mas probable).
+    """
+    for i in range(iterations):
+        node = rootnode
+        state = rootstate.Clone()
+        path = [node]
+
+        # Seleccion
+        while node.untriedMoves == [] and node.childNodes != []:
+            node = node.UCTSelectChild(exploration)
+            state.DoMove(node.move)
+            path.append(node)
+
+        # Expansion
+        if node.untriedMoves != []:
+            m = node.untriedMoves[-1]
+            state.DoMove(m)
+            node = node.AddChild(m, state)
+            random.shuffle(node.untriedMoves)
+            path.append(node)
+
+        # Evaluacion (en lugar de la simulacion)
+        if state.IsGameOver():
+            results = state.GetResults()
+        else:
+            for n in path:
+                n.visits += virtualLoss
+            value, priors = await queue.Evaluate(state)
+            for n in path:
+                n.visits -= virtualLoss
+            if priors is not None:
+                node.untriedMoves.sort(key=lambda move: priors[move])
+            results = [1 - value] * 2  # 2 jugadores: el valor para el otro jugador es 1 - valor
+            results[state.playerJustMoved - 1] = value
+
+        # Retropropagacion
+        for n in path:
+            n.Update(results[n.playerJustMoved - 1])
+
+
+async def AsyncUCTSearch(rootstate, itermax, queue, coroutines=None, virtualLoss=3, exploration=1.0, rootnode=None):
+    """ Construye el game tree de MCTS-UCT con itermax iteraciones evaluando las hojas con queue (ver EvaluationQueue).
+        Solo para 2 jugadores: el valor de una hoja para el otro jugador es 1 - valor.
+
+        @input queue: (EvaluationQueue) cola de evaluacion; se puede compartir entre varias busquedas.
+        @input coroutines: (int) corrutinas que bajan por el arbol a la vez = hojas pendientes de esta busqueda.
+                           Por defecto queue.batchSize, para que una sola busqueda llene los lotes.
+        @input virtualLoss: (int) visitas sin victoria que se anhaden a cada nodo del camino mientras se espera la evaluacion.
+
+        @output rootnode: (Node) nodo raiz del game tree construido.
+    """
+    assert rootstate.numPlayers == 2, "AsyncUCTSearch solo funciona con 2 jugadores"
+    if rootnode is None:
+        rootnode = Node(state=rootstate)
+        random.shuffle(rootnode.untriedMoves)
+    coroutines = min(coroutines or queue.batchSize, itermax)
+    iterations = [itermax // coroutines + (1 if k < itermax % coroutines else 0) for k in range(coroutines)]
+    await asyncio.gather(*[SearchWorker(rootnode, rootstate, n, queue, virtualLoss, exploration)
+                           for n in iterations])
+    return rootnode
+
+
+def EvaluatorUCT(rootstate, itermax, evaluator, batchSize=32, virtualLoss=3, exploration=1.0):
+    """ Version sincrona de AsyncUCTSearch con su propia cola, con la misma salida que TranspositionUCT.
+
+        @output move: (int) accion que llevar a cabo este turno.
+        @output iterations: (int) numero de iteraciones que se han ejecutado.
+    """
+    queue = EvaluationQueue(evaluator, batchSize)
+    rootnode = asyncio.run(AsyncUCTSearch(rootstate, itermax, queue, virtualLoss=virtualLoss, exploration=exploration))
+    return SelectMove(rootnode), rootnode.visits
+
+
+def BenchmarkBatchSize(batchSizes=(1, 4, 16, 64, 256), itermax=4000, games=1, seed=0):
+    """ Iteraciones por segundo de AsyncUCTSearch con LinearEvaluator segun el tamanho del lote. Con games > 1 se hacen
+        games busquedas a la vez (cada una con batchSize corrutinas) compartiendo la misma cola, como en self-play.
+        Tambien se mide el tamanho medio de los lotes y la parte del tiempo que se pasa dentro de Evaluate.
+    """
+    rootstate = BitboardConnect4State(width=7, height=6)
+    print("lote  busquedas  iteraciones/s  lotes  hojas/lote  %tiempo en Evaluate")
+    for batchSize in batchSizes:
+        random.seed(seed)
+        evaluator = LinearEvaluator(seed=seed)
+        queue = EvaluationQueue(evaluator, batchSize * games)
+
+        async def Searches():
+            return await asyncio.gather(*[AsyncUCTSearch(rootstate, itermax, queue, coroutines=batchSize)
+                                          for g in range(games)])
+
+        start = time.time()
+        asyncio.run(Searches())
+        elapsed = time.time() - start
+        print("%4d  %9d  %13.0f  %5d  %10.1f  %19.0f" % (batchSize, games, games * itermax / elapsed, queue.batches,
+                                                         queue.positions / max(1, queue.batches),
+                                                         100 * evaluator.seconds / elapsed))
+
+
+def Main(argv=None):
+    parser = argparse.ArgumentParser(prog="mcts_evaluator",
+                                     description="Iteraciones/s de MCTS-UCT con evaluacion de hojas en lote.")
+    parser.add_argument("--batch-sizes", default="1,4,16,64,256", help="tamanhos de lote separados por comas")
+    parser.add_argument("--itermax", type=int, default=4000)
+    parser.add_argument("--games", type=int, default=1, help="busquedas a la vez compartiendo la cola")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    BenchmarkBatchSize([int(b) for b in args.batch_sizes.split(",")], itermax=args.itermax, games=args.games,
+                       seed=args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
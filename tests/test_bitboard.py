@@ -0,0 +1,77 @@
+# Comprueba que BitboardConnect4State juega exactamente igual que Connect4State (la implementacion de referencia).
+# python -m pytest tests/test_bitboard.py, o python -m mcts parity
+
+import random
+
+import pytest
+
+from mcts import BitboardConnect4State, Connect4State
+
+# (ancho, alto, fichas en linea, jugadores)
+VARIANTS = [(7, 6, 4, 2), (6, 5, 4, 2), (8, 7, 4, 2), (8, 7, 5, 2), (7, 6, 4, 3), (5, 4, 3, 2)]
+
+
+def Expect(condition, message):
+    """ Falla el test con message si condition es falsa. A diferencia de assert, no desaparece con python -O.
+    """
+    if not condition:
+        pytest.fail(message)
+
+
+def CheckSameState(reference, bitboard, width, height, players):
+    """ Compara los dos estados despues de un movimiento: tablero, movimientos, ganador, hashes y Mirror().
+    """
+    moves = reference.GetMoves()
+    Expect(moves == bitboard.GetMoves(), "GetMoves distinto: %s %s" % (moves, bitboard.GetMoves()))
+    Expect(reference.IsGameOver() == bitboard.IsGameOver(), "IsGameOver distinto")
+    Expect(reference.winner == bitboard.winner, "winner distinto: %d %d" % (reference.winner, bitboard.winner))
+    results = [int(reference.GetResult(p)) for p in range(1, players + 1)]
+    Expect(reference.GetResults() == bitboard.GetResults() == results, "GetResults distinto")
+    Expect(reference.playerJustMoved == bitboard.playerJustMoved, "playerJustMoved distinto")
+    Expect(reference.hash == bitboard.hash, "hash distinto")
+    Expect(reference.mirrorHash == bitboard.mirrorHash, "mirrorHash distinto")
+    Expect(reference.moveCount == bitboard.moveCount, "moveCount distinto")
+    free = [col for col in range(width) if reference.board[col][height - 1] == 0]
+    Expect(reference.IsGameOver() == (free == [] or reference.winner != 0), "IsGameOver no cuadra con el tablero")
+    Expect(moves == ([] if reference.winner else free), "GetMoves no cuadra con el tablero")
+    for x in range(width):
+        for y in range(height):
+            Expect(reference.board[x][y] == bitboard.GetCell(x, y), "casilla (%d, %d) distinta" % (x, y))
+
+    mirrored, bitboardMirrored = reference.Mirror(), bitboard.Mirror()
+    Expect(mirrored.hash == reference.mirrorHash and mirrored.mirrorHash == reference.hash, "Mirror() no intercambia los hashes")
+    Expect(mirrored.GetMoves() == bitboardMirrored.GetMoves() == sorted(width - 1 - m for m in moves),
+           "GetMoves del reflejo distinto")
+    for x in range(width):
+        for y in range(height):
+            Expect(mirrored.board[width - 1 - x][y] == bitboardMirrored.GetCell(width - 1 - x, y) == reference.board[x][y],
+                   "casilla (%d, %d) del reflejo distinta" % (x, y))
+
+
+@pytest.mark.parametrize("width, height, connect, players", VARIANTS)
+def testBitboardParity(width, height, connect, players, games=500, seed=0):
+    """ Partidas aleatorias con los dos estados a la vez. Algunos movimientos se deshacen con UndoMove, y el bitboard
+        se clona antes de cada movimiento para comprobar tambien Clone().
+    """
+    rng = random.Random(seed)
+    for g in range(games):
+        reference = Connect4State(width=width, height=height, connect=connect, players=players)
+        bitboard = BitboardConnect4State(width=width, height=height, connect=connect, players=players)
+        while True:
+            CheckSameState(reference, bitboard, width, height, players)
+            if reference.IsGameOver():
+                break
+            move = rng.choice(reference.GetMoves())
+            if rng.random() < 0.2:  # DoMove + UndoMove tiene que dejar el estado como estaba
+                before = (reference.hash, reference.mirrorHash, reference.winner, reference.playerJustMoved,
+                          [col[:] for col in reference.board])
+                reference.DoMove(move)
+                reference.UndoMove()
+                Expect(before == (reference.hash, reference.mirrorHash, reference.winner, reference.playerJustMoved,
+                                  reference.board), "UndoMove no deja el estado como estaba")
+                bitboard.DoMove(move)
+                bitboard.UndoMove()
+                continue
+            reference.DoMove(move)
+            bitboard = bitboard.Clone()
+            bitboard.DoMove(move)
@@ -0,0 +1,60 @@
+# Comprueba que NodeLimit limita el game tree: con una busqueda 20 veces mas larga que el limite, el arbol no pasa
+# de maxNodes nodos, las estadisticas siguen siendo validas y la memoria residente no crece.
+# python -m pytest tests/test_node_limit.py, o python -m mcts check-memory
+
+import gc
+import os
+import random
+
+import pytest
+
+from mcts import BitboardConnect4State, CountNodes, NodeLimit, SearchStats, SelectMove, UCTSearch
+
+
+def ResidentMemory():
+    """ Memoria residente (RSS) actual del proceso en bytes, de /proc/self/statm (Linux). None si no se puede leer.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, AttributeError):
+        return None
+
+
+@pytest.mark.parametrize("prune", [False, True])
+def testNodeLimit(prune, maxNodes=5000, itermax=100000, sampleEvery=5000, seed=0):
+    """ Sin poda (se deja de expandir) y con poda (se reutilizan los nodos de los subarboles menos visitados).
+    """
+    rootstate = BitboardConnect4State(width=7, height=6)
+    random.seed(seed)
+    nodeLimit = NodeLimit(maxNodes, prune=prune)
+    samples = []
+
+    def Sample(stats):
+        if nodeLimit.count > maxNodes:
+            pytest.fail("el arbol tiene %d nodos, mas que el limite %d" % (nodeLimit.count, maxNodes))
+        samples.append(ResidentMemory())
+
+    gc.collect()
+    rootnode = UCTSearch(rootstate, itermax, stats=SearchStats(Sample, sampleEvery), nodeLimit=nodeLimit)
+    if rootnode.visits != itermax:
+        pytest.fail("la raiz tiene %d visitas en vez de %d" % (rootnode.visits, itermax))
+    nodes = CountNodes(rootnode)
+    if nodes != nodeLimit.count or nodes > maxNodes:
+        pytest.fail("el arbol tiene %d nodos, NodeLimit cuenta %d (limite %d)" % (nodes, nodeLimit.count, maxNodes))
+    stack = [rootnode]
+    while stack:
+        node = stack.pop()
+        if node.visits < sum(c.visits for c in node.childNodes):
+            pytest.fail("un nodo tiene menos visitas que la suma de sus hijos")
+        stack.extend(node.childNodes)
+    if SelectMove(rootnode) not in rootstate.GetMoves():
+        pytest.fail("SelectMove devuelve un movimiento ilegal")
+
+    if samples[0] is None:
+        pytest.skip("sin medida de memoria residente en este sistema")
+    growth = samples[-1] - samples[1]  # samples[0]: el arbol puede no estar lleno todavia
+    print("%s: %d nodos, %d podados, memoria residente %.1f MB -> %.1f MB" % (
+        "poda" if prune else "sin expandir", nodeLimit.count, nodeLimit.pruned, samples[1] / 2 ** 20, samples[-1] / 2 ** 20))
+    if growth >= 2 ** 20:
+        pytest.fail("la memoria residente ha crecido %d bytes" % growth)